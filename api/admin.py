@@ -1,13 +1,21 @@
 from django.contrib import admin
 
+from api.models.archive_model import BugArchive, TaskArchive, SubTaskArchive
 from api.models.bug_model import Bug
 from api.models.sub_task_model import SubTask
 from api.models.task_model import Task
 from api.models.login_info_model import LoginInfo
 from api.models.profile_model import Profile
+from api.models.token_revocation_model import TokenRevocation
+from api.models.user_stats_model import UserStats
 
 admin.site.register(Bug)
 admin.site.register(Task)
 admin.site.register(SubTask)
 admin.site.register(LoginInfo)
 admin.site.register(Profile)
+admin.site.register(TokenRevocation)
+admin.site.register(UserStats)
+admin.site.register(BugArchive)
+admin.site.register(TaskArchive)
+admin.site.register(SubTaskArchive)
@@ -2,22 +2,30 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import AuthenticationFailed
 
-from api.authentication.token_expire_handler import token_expire_handler
+from api.authentication.token_cache import token_cache
+from api.authentication.token_expire_handler import is_token_expired
 
 
 class ExpiringTokenAuthentication(TokenAuthentication):
 
     def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            if not cached.is_active:
+                raise AuthenticationFailed("User is not active")
+            return cached.user, cached.token
+
         try:
-            token = Token.objects.get(key=key)
+            token = Token.objects.select_related('user').get(key=key)
         except Token.DoesNotExist:
             raise AuthenticationFailed("Invalid Token")
 
         if not token.user.is_active:
+            token_cache.set(token)
             raise AuthenticationFailed("User is not active")
 
-        is_expired, token = token_expire_handler(token)
-        if is_expired:
+        if is_token_expired(token):
             raise AuthenticationFailed("The Token is expired")
 
+        token_cache.set(token)
         return token.user, token
@@ -0,0 +1,128 @@
+"""
+Stateless alternative to the DB-backed authtoken Token, enabled with AUTH_TOKEN_MODE = 'signed'. A token is
+'<user id>:<superuser flag>:<issued at, ms>:<expires at, s>:<signature>', HMAC-signed with SECRET_KEY, so verifying it
+is a signature and clock check. Revocation is per user: every token issued up to TokenRevocation.revoked_at is rejected,
+compared in milliseconds so that a login in the same second as a revocation still gets a usable token. A user is revoked
+when deactivated or when is_superuser/is_staff change, so the superuser claim never outlives the privilege. The
+revocations are mirrored in an in-memory deny-list reloaded every SIGNED_TOKEN_DENY_LIST_REFRESH_SECONDS.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.db.models import signals
+from django.utils import timezone
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from api.models.token_revocation_model import TokenRevocation
+
+SIGNED_TOKEN_SALT = 'api.authentication.signed_token'
+
+SignedToken = namedtuple('SignedToken', ['key', 'user', 'issued_at', 'expires_at'])
+
+signer = signing.Signer(salt=SIGNED_TOKEN_SALT)
+
+
+def is_signed_token_mode():
+    return getattr(settings, 'AUTH_TOKEN_MODE', 'db') == 'signed'
+
+
+def to_milliseconds(moment):
+    return int(moment.timestamp()) * 1000 + moment.microsecond // 1000
+
+
+def issue_signed_token(user):
+    issued_at = time.time_ns() // 1000000
+    expires_at = issued_at // 1000 + settings.TOKEN_EXPIRED_AFTER_SECONDS
+    key = signer.sign('%d:%d:%d:%d' % (user.pk, user.is_superuser, issued_at, expires_at))
+    return SignedToken(key=key, user=user, issued_at=issued_at, expires_at=expires_at)
+
+
+def signed_token_expires_in(token):
+    return max(token.expires_at - int(time.time()), 0)
+
+
+class DenyList:
+
+    def __init__(self, refresh_interval):
+        self.refresh_interval = refresh_interval
+        self._revoked = {}
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self):
+        since = timezone.now() - timedelta(seconds=settings.TOKEN_EXPIRED_AFTER_SECONDS)
+        revoked = dict((user_id, to_milliseconds(revoked_at))
+                       for user_id, revoked_at in TokenRevocation.objects.filter(revoked_at__gte=since)
+                                                                        .values_list('user_id', 'revoked_at'))
+        with self._lock:
+            self._revoked = revoked
+            self._refreshed_at = time.monotonic()
+
+    def ensure_fresh(self):
+        """
+        Only one thread reloads a stale deny-list; the others keep answering from the previous set meanwhile. Before
+        the first load there is no previous set, so callers wait for it.
+        """
+        if self._refreshed_at is None:
+            with self._refresh_lock:
+                if self._refreshed_at is None:
+                    self.refresh()
+        elif time.monotonic() - self._refreshed_at > self.refresh_interval and \
+                self._refresh_lock.acquire(blocking=False):
+            try:
+                self.refresh()
+            finally:
+                self._refresh_lock.release()
+
+    def is_revoked(self, user_id, issued_at):
+        self.ensure_fresh()
+        revoked_at = self._revoked.get(user_id)
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def add(self, user_id, revoked_at):
+        with self._lock:
+            self._revoked[user_id] = to_milliseconds(revoked_at)
+
+    def clear(self):
+        with self._lock:
+            self._revoked = {}
+            self._refreshed_at = None
+
+
+deny_list = DenyList(refresh_interval=getattr(settings, 'SIGNED_TOKEN_DENY_LIST_REFRESH_SECONDS', 30))
+
+
+class SignedTokenAuthentication(TokenAuthentication):
+
+    def authenticate_credentials(self, key):
+        if not is_signed_token_mode() or key.count(signer.sep) != 4:
+            return None
+
+        try:
+            user_id, is_superuser, issued_at, expires_at = (int(part) for part in signer.unsign(key).split(signer.sep))
+        except (signing.BadSignature, ValueError):
+            raise AuthenticationFailed("Invalid Token")
+
+        if expires_at <= int(time.time()):
+            raise AuthenticationFailed("The Token is expired")
+
+        if deny_list.is_revoked(user_id, issued_at):
+            raise AuthenticationFailed("The Token is revoked")
+
+        user = User(pk=user_id, is_superuser=bool(is_superuser), is_active=True)
+        return user, SignedToken(key=key, user=user, issued_at=issued_at, expires_at=expires_at)
+
+
+def token_revocation_post_save(sender, instance, **kwargs):
+    deny_list.add(instance.user_id, instance.revoked_at)
+
+
+signals.post_save.connect(token_revocation_post_save, sender=TokenRevocation)
@@ -0,0 +1,99 @@
+"""
+In-process LRU cache of resolved tokens used by ExpiringTokenAuthentication. Entries never outlive the token itself and
+are dropped when the token is deleted/rotated or its user is saved (e.g. deactivated). Each worker process holds its own
+cache, so TOKEN_CACHE_TTL_SECONDS bounds how long another process may serve a stale entry. Invalidation hangs off the
+post_save/post_delete signals: a queryset .update() on User or Token bypasses them, so code that deactivates users that
+way must call token_cache.invalidate_user() itself (or wait out the TTL). get() hands out copies of the cached token and
+user, so a request mutating its request.user never leaks into other requests or threads.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import signals
+from rest_framework.authtoken.models import Token
+
+from api.authentication.token_expire_handler import expires_in
+
+CachedToken = namedtuple('CachedToken', ['token', 'user', 'created', 'is_active', 'expires_at'])
+
+
+class TokenCache:
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        user, token = copy.copy(entry.user), copy.copy(entry.token)
+        token.user = user
+        return entry._replace(token=token, user=user)
+
+    def set(self, token):
+        ttl = min(self.ttl, expires_in(token).total_seconds())
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        entry = CachedToken(token=token,
+                            user=token.user,
+                            created=token.created,
+                            is_active=token.user.is_active,
+                            expires_at=time.monotonic() + ttl)
+        with self._lock:
+            self._entries[token.key] = entry
+            self._entries.move_to_end(token.key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.user.pk == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+token_cache = TokenCache(max_size=getattr(settings, 'TOKEN_CACHE_MAX_SIZE', 1024),
+                         ttl=min(getattr(settings, 'TOKEN_CACHE_TTL_SECONDS', 300),
+                                 settings.TOKEN_EXPIRED_AFTER_SECONDS))
+
+
+def token_post_delete(sender, instance, **kwargs):
+    token_cache.invalidate(instance.key)
+
+
+def user_post_save(sender, instance, **kwargs):
+    token_cache.invalidate_user(instance.pk)
+
+
+signals.post_delete.connect(token_post_delete, sender=Token)
+signals.post_save.connect(user_post_save, sender=User)
+signals.post_delete.connect(user_post_save, sender=User)
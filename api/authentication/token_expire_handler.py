@@ -1,9 +1,17 @@
+import threading
+
+from django.contrib.auth.models import User
+from django.db import transaction
 from rest_framework.authtoken.models import Token
 
 from datetime import timedelta
 from django.utils import timezone
 from django.conf import settings
 
+ROTATION_LOCK_STRIPES = 64
+
+_rotation_locks = [threading.Lock() for _ in range(ROTATION_LOCK_STRIPES)]
+
 
 def expires_in(token):
     time_elapsed = timezone.now() - token.created
@@ -15,9 +23,20 @@ def is_token_expired(token):
     return expires_in(token) < timedelta(seconds=0)
 
 
-def token_expire_handler(token):
-    is_expired = is_token_expired(token)
-    if is_expired:
-        token.delete()
-        token = Token.objects.create(user=token.user)
-    return is_expired, token
+def expired_tokens():
+    return Token.objects.filter(created__lt=timezone.now() - timedelta(seconds=settings.TOKEN_EXPIRED_AFTER_SECONDS))
+
+
+def get_or_rotate_token(user):
+    """
+    Returns the user's live token, replacing it when expired. Rotation is single-flight: concurrent logins of the same
+    user are serialized by a striped in-process lock and, across processes, by a row lock on the user.
+    """
+    with _rotation_locks[user.pk % ROTATION_LOCK_STRIPES], transaction.atomic():
+        list(User.objects.select_for_update().filter(pk=user.pk).values_list('pk'))
+        token = Token.objects.filter(user=user).first()
+        if token is not None and not is_token_expired(token):
+            return token
+        if token is not None:
+            token.delete()
+        return Token.objects.create(user=user)
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api.models.archive_model import BugArchive, TaskArchive, SubTaskArchive
+from api.models.bug_model import Bug
+from api.models.choices.status_choices import Status
+from api.models.sub_task_model import SubTask
+from api.models.task_model import Task
+
+
+class Command(BaseCommand):
+    help = 'Moves DELETED bugs, tasks and subtasks older than --older-than-days into the archive tables, in chunks. ' \
+           'Each chunk is its own transaction and a task is archived together with its subtasks, so an interrupted ' \
+           'run is resumed by running the command again'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int,
+                            default=getattr(settings, 'ARCHIVE_DELETED_AFTER_DAYS', 30))
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        deleted = dict(status=Status.DELETED, updated_at__lt=cutoff)
+        archived = dict(bugs=0, tasks=0, subtasks=0)
+
+        sub_tasks = SubTask.objects.filter(**deleted).select_related('task')
+        while True:
+            chunk = self.next_chunk(sub_tasks, batch_size)
+            if not chunk:
+                break
+            archived['subtasks'] += SubTaskArchive.archive(sub_tasks.filter(pk__in=chunk))
+
+        tasks = Task.objects.filter(**deleted)
+        while True:
+            chunk = self.next_chunk(tasks, batch_size)
+            if not chunk:
+                break
+            with transaction.atomic():
+                chunk = list(tasks.filter(pk__in=chunk).select_for_update().values_list('pk', flat=True))
+                children = SubTask.objects.filter(task__in=chunk).select_related('task')
+                archived['subtasks'] += SubTaskArchive.archive(children)
+                archived['tasks'] += TaskArchive.archive(tasks.filter(pk__in=chunk))
+
+        bugs = Bug.objects.filter(**deleted)
+        while True:
+            chunk = self.next_chunk(bugs, batch_size)
+            if not chunk:
+                break
+            archived['bugs'] += BugArchive.archive(bugs.filter(pk__in=chunk))
+
+        self.stdout.write('Archived %(bugs)d bugs, %(tasks)d tasks and %(subtasks)d subtasks' % archived)
+
+    @staticmethod
+    def next_chunk(queryset, batch_size):
+        return list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
@@ -0,0 +1,62 @@
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.test import force_authenticate
+
+from api.models.bug_model import Bug
+from api.models.choices.status_choices import Status
+from api.views.bug_view import BugViewSet
+from api.views.cached_list_view import invalidate_owner_responses
+
+
+class Command(BaseCommand):
+    help = 'Polls GET /v1/bugs the way a client does, replaying the last ETag, with a new bug every --write-every ' \
+           'polls. Reports the share of polls answered 304 and their latency against a full 200. The polls are an ' \
+           'in-process simulation through RequestFactory, so the latencies leave out HTTP, middleware and the ' \
+           'network. Rows are created inside a transaction that is rolled back at the end'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bugs', type=int, default=1000)
+        parser.add_argument('--polls', type=int, default=200)
+        parser.add_argument('--write-every', type=int, default=10)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create(username='benchmark-%s' % uuid.uuid4().hex[:12])
+            Bug.objects.bulk_create(
+                [Bug(title='Bug', description='description', priority='HIGH', status=Status.NEW, author=user)
+                 for _ in range(options['bugs'])], batch_size=5000)
+            timings = self.poll(user, options['polls'], options['write_every'])
+            transaction.set_rollback(True)
+
+        not_modified, full = timings[304], timings[200]
+        self.stdout.write('polls: %d' % (len(not_modified) + len(full)))
+        self.stdout.write('304: %d (%.1f%%)' % (len(not_modified), 100.0 * len(not_modified) / options['polls']))
+        self.stdout.write('304 ms: %.2f' % self.mean(not_modified))
+        self.stdout.write('200 ms: %.2f' % self.mean(full))
+
+    def poll(self, user, polls, write_every):
+        view = BugViewSet.as_view({'get': 'list'})
+        timings = {200: [], 304: []}
+        etag = None
+        for poll in range(polls):
+            if write_every and poll and poll % write_every == 0:
+                Bug.objects.create(title='Bug', description='description', priority='HIGH', status=Status.NEW,
+                                   author=user)
+                invalidate_owner_responses(user.pk)
+            headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+            request = RequestFactory().get('/v1/bugs', **headers)
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            response = view(request)
+            timings[response.status_code].append((time.perf_counter() - started) * 1000)
+            etag = response['ETag']
+        return timings
+
+    @staticmethod
+    def mean(values):
+        return sum(values) / len(values) if values else 0.0
@@ -0,0 +1,64 @@
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import force_authenticate
+
+from api.models.bug_model import Bug
+from api.models.choices.status_choices import Status
+from api.views.bug_view import BugViewSet
+from api.views.conditional_view import ConditionalGetMixin
+
+
+class CountedBugViewSet(BugViewSet):
+    # Plain list: no response cache and no conditional aggregate, whose count would stand in for the one measured here.
+
+    def list(self, request, *args, **kwargs):
+        return super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+
+
+class UncachedBugViewSet(CountedBugViewSet):
+    pagination_class = PageNumberPagination
+
+
+class Command(BaseCommand):
+    help = 'Times GET /v1/bugs with a COUNT(*) per request against the cached count, for growing numbers of bugs. ' \
+           'Rows are created inside a transaction that is rolled back at the end'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--requests', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create(username='benchmark-%s' % uuid.uuid4().hex[:12])
+            seeded = 0
+            self.stdout.write('%10s %14s %14s' % ('bugs', 'count(*) ms', 'cached ms'))
+            for size in sorted(options['sizes']):
+                Bug.objects.bulk_create(
+                    [Bug(title='Bug', description='description', priority='HIGH', status=Status.NEW, author=user)
+                     for _ in range(size - seeded)], batch_size=5000)
+                seeded = size
+                self.invalidate_caches(user)
+                exact = self.time_list(UncachedBugViewSet, user, options['requests'])
+                cached = self.time_list(CountedBugViewSet, user, options['requests'])
+                self.stdout.write('%10d %14.2f %14.2f' % (size, exact, cached))
+            transaction.set_rollback(True)
+
+    def invalidate_caches(self, user):
+        view = BugViewSet()
+        view._owner = user
+        view.invalidate_caches()
+
+    def time_list(self, viewset, user, requests):
+        view = viewset.as_view({'get': 'list'})
+        started = time.perf_counter()
+        for _ in range(requests):
+            request = RequestFactory().get('/v1/bugs', {'page': 2})
+            force_authenticate(request, user=user)
+            view(request)
+        return (time.perf_counter() - started) * 1000 / requests
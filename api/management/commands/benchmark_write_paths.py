@@ -0,0 +1,63 @@
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import force_authenticate
+
+from api.models.bug_model import Bug
+from api.models.sub_task_model import SubTask
+from api.models.task_model import Task
+from api.models.user_stats_model import UserStats
+from api.views.bug_view import BugViewSet
+from api.views.sub_task_view import SubTaskViewSet
+from api.views.task_view import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = 'Times PATCH and DELETE on bugs, tasks and subtasks and reports statements per request. ' \
+           'Rows are created inside a transaction that is rolled back at the end'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        requests = options['requests']
+        with transaction.atomic():
+            user = User.objects.create(username='benchmark-%s' % uuid.uuid4().hex[:12])
+            task = Task.objects.create(body='Benchmark task', author=user, sub_tasks_count=requests)
+            bugs = Bug.objects.bulk_create([Bug(title='Bug', description='description', priority='HIGH', author=user)
+                                            for _ in range(requests)])
+            UserStats.increment(user, total_bugs=len(bugs), active_bugs=len(bugs))
+            tasks = Task.objects.bulk_create([Task(body='Task', author=user) for _ in range(requests)])
+            sub_tasks = SubTask.objects.bulk_create([SubTask(description='Sub task', task=task)
+                                                     for _ in range(requests)])
+            cases = [
+                ('bugs', BugViewSet, {'title': 'Renamed'}, bugs, {}),
+                ('tasks', TaskViewSet, {'body': 'Renamed'}, tasks, {}),
+                ('subtasks', SubTaskViewSet, {'description': 'Renamed'}, sub_tasks, {'task_pk': task.pk}),
+            ]
+
+            self.stdout.write('%-10s %-8s %12s %12s' % ('resource', 'action', 'ms/request', 'statements'))
+            for name, viewset, data, rows, kwargs in cases:
+                for method, action, body in (('patch', 'partial_update', data), ('delete', 'destroy', None)):
+                    elapsed, statements = self.time_action(user, viewset, method, action, body, rows, kwargs)
+                    self.stdout.write('%-10s %-8s %12.3f %12.1f' % (
+                        name, method.upper(), elapsed * 1000 / len(rows), statements / len(rows)))
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def time_action(user, viewset, method, action, body, rows, kwargs):
+        view = viewset.as_view({method: action})
+        factory = RequestFactory()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for row in rows:
+                request = getattr(factory, method)('/v1/benchmark', data=body, content_type='application/json')
+                force_authenticate(request, user=user)
+                view(request, pk=row.pk, **kwargs)
+            elapsed = time.perf_counter() - started
+        return elapsed, len(queries)
@@ -0,0 +1,40 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.provisioning.user_import import import_users, UserImportError
+
+
+class Command(BaseCommand):
+    help = 'Creates candidate users from a JSON array or a CSV file with username, email, name and password columns, ' \
+           'hashing passwords across a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--processes', type=int, default=None, help='Hashing processes, defaults to the CPU count')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rows = self.read_rows(options['path'])
+        batch_size = options['batch_size']
+        imported, seconds = 0, 0.0
+
+        for offset in range(0, len(rows), batch_size):
+            try:
+                result = import_users(rows[offset:offset + batch_size], options['processes'])
+            except UserImportError as error:
+                raise CommandError('The batch starting at row %d was not imported, %d users were: %s' % (
+                    offset, imported, json.dumps(error.errors)))
+            imported += len(result.users)
+            seconds += result.seconds
+
+        self.stdout.write('Imported %d users in %.2fs (%.1f users/sec)' % (
+            imported, seconds, imported / seconds if seconds else imported))
+
+    @staticmethod
+    def read_rows(path):
+        with open(path, newline='') as source:
+            if path.endswith('.csv'):
+                return list(csv.DictReader(source))
+            return json.load(source)
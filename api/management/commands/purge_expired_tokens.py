@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from api.authentication.token_expire_handler import expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Deletes expired authentication tokens in chunked batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        purged = 0
+        while True:
+            keys = list(expired_tokens().values_list('key', flat=True)[:batch_size])
+            if not keys:
+                break
+            purged += expired_tokens().filter(key__in=keys).delete()[0]
+        self.stdout.write('Purged %d expired tokens' % purged)
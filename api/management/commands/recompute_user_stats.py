@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models.user_stats_model import UserStats
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds UserStats from the bug, task, subtask and login tables and reports drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='Only report drift, do not fix it')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        computed_fields = ['computed_' + counter for counter in UserStats.COUNTERS]
+        drift = dict((counter, 0) for counter in UserStats.COUNTERS)
+        checked = drifted = last_pk = 0
+
+        while True:
+            users = UserStats.with_computed_counters(User.objects.filter(pk__gt=last_pk).order_by('pk'))
+            computed = list(users.values('pk', *computed_fields)[:batch_size])
+            if not computed:
+                break
+            last_pk = computed[-1]['pk']
+            existing = dict((stats.user_id, stats)
+                            for stats in UserStats.objects.filter(user_id__in=[row['pk'] for row in computed]))
+            to_create, to_update = [], []
+            for row in computed:
+                stats = existing.get(row['pk'])
+                missing = stats is None
+                if missing:
+                    stats = UserStats(user_id=row['pk'])
+                changed = [counter for counter in UserStats.COUNTERS
+                           if getattr(stats, counter) != row['computed_' + counter]]
+                for counter in changed:
+                    drift[counter] += 1
+                    setattr(stats, counter, row['computed_' + counter])
+                if missing:
+                    to_create.append(stats)
+                elif changed:
+                    to_update.append(stats)
+                if missing or changed:
+                    drifted += 1
+            checked += len(computed)
+            if not options['dry_run']:
+                with transaction.atomic():
+                    UserStats.objects.bulk_create(to_create)
+                    UserStats.objects.bulk_update(to_update, UserStats.COUNTERS)
+
+        self.stdout.write('Checked %d users, %d drifted' % (checked, drifted))
+        for counter in UserStats.COUNTERS:
+            self.stdout.write('  %s: %d' % (counter, drift[counter]))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from api.models.choices.status_choices import ACTIVE_STATUSES
+from api.models.task_model import Task
+from api.views.cached_list_view import invalidate_owner_responses
+
+
+class Command(BaseCommand):
+    help = 'Reconciles Task.sub_tasks_count with the number of live subtasks, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        checked = repaired = last_pk = 0
+
+        while True:
+            tasks = list(Task.objects.filter(pk__gt=last_pk).order_by('pk')
+                         .annotate(live_sub_tasks=Count('subtask', filter=Q(subtask__status__in=ACTIVE_STATUSES)))
+                         .only('pk', 'author_id', 'sub_tasks_count')[:batch_size])
+            if not tasks:
+                break
+            last_pk = tasks[-1].pk
+            drifted = [task for task in tasks if task.sub_tasks_count != task.live_sub_tasks]
+            now = timezone.now()
+            with transaction.atomic():
+                for task in drifted:
+                    Task.objects.filter(pk=task.pk, sub_tasks_count=task.sub_tasks_count) \
+                        .update(sub_tasks_count=task.live_sub_tasks, updated_at=now, version=F('version') + 1)
+            for author_id in {task.author_id for task in drifted}:
+                invalidate_owner_responses(author_id)
+            checked += len(tasks)
+            repaired += len(drifted)
+
+        self.stdout.write('Checked %d tasks, repaired %d' % (checked, repaired))
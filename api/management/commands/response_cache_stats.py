@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api.views.cached_list_view import response_cache_stats, reset_response_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Reports hits, misses and hit ratio of the per-owner list response cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after reporting them')
+
+    def handle(self, *args, **options):
+        hits, misses, ratio = response_cache_stats()
+        self.stdout.write('hits: %d' % hits)
+        self.stdout.write('misses: %d' % misses)
+        self.stdout.write('hit ratio: %.1f%%' % (100 * ratio))
+        if options['reset']:
+            reset_response_cache_stats()
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_user_stats(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UserStats = apps.get_model('api', 'UserStats')
+    Bug = apps.get_model('api', 'Bug')
+    Task = apps.get_model('api', 'Task')
+    SubTask = apps.get_model('api', 'SubTask')
+    LoginInfo = apps.get_model('api', 'LoginInfo')
+
+    def counts(queryset, user_field):
+        return dict(queryset.order_by().values_list(user_field).annotate(count=Count('pk')))
+
+    total_bugs = counts(Bug.objects.all(), 'author')
+    active_bugs = counts(Bug.objects.exclude(status='DELETED'), 'author')
+    total_tasks = counts(Task.objects.all(), 'author')
+    total_subtasks = counts(SubTask.objects.all(), 'task__author')
+    total_logins = counts(LoginInfo.objects.all(), 'user')
+    UserStats.objects.bulk_create([
+        UserStats(user_id=user_id,
+                  total_bugs=total_bugs.get(user_id, 0),
+                  active_bugs=active_bugs.get(user_id, 0),
+                  total_tasks=total_tasks.get(user_id, 0),
+                  total_subtasks=total_subtasks.get(user_id, 0),
+                  total_logins=total_logins.get(user_id, 0))
+        for user_id in User.objects.values_list('pk', flat=True).iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_token_revocation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_bugs', models.PositiveIntegerField(default=0)),
+                ('active_bugs', models.PositiveIntegerField(default=0)),
+                ('total_tasks', models.PositiveIntegerField(default=0)),
+                ('total_subtasks', models.PositiveIntegerField(default=0)),
+                ('total_logins', models.PositiveIntegerField(default=0)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(populate_user_stats, migrations.RunPython.noop),
+    ]
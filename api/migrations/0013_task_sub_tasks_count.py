@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, IntegerField
+from django.db.models.functions import Coalesce
+
+
+def populate_sub_tasks_count(apps, schema_editor):
+    Task = apps.get_model('api', 'Task')
+    SubTask = apps.get_model('api', 'SubTask')
+    counts = SubTask.objects.filter(task=OuterRef('pk'), status__in=['NEW', 'UPDATED']).order_by().values('task')
+    Task.objects.update(sub_tasks_count=Coalesce(
+        Subquery(counts.annotate(count=Count('pk')).values('count'), output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_userstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='sub_tasks_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_sub_tasks_count, migrations.RunPython.noop),
+    ]
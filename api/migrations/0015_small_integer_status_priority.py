@@ -0,0 +1,125 @@
+from django.db import migrations, models
+
+import api.models.fields.small_integer_choice_field
+
+STATUS_CHOICES = [('NEW', 'New'), ('UPDATED', 'Updated'), ('DELETED', 'Deleted')]
+STATUS_CODES = {'NEW': 1, 'UPDATED': 2, 'DELETED': 3}
+PRIORITY_CHOICES = [('HIGH', 'High'), ('MEDIUM', 'Medium'), ('LOW', 'Low')]
+PRIORITY_CODES = {'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
+CONVERTED_FIELDS = [
+    ('bug', 'status', STATUS_CODES),
+    ('bug', 'priority', PRIORITY_CODES),
+    ('task', 'status', STATUS_CODES),
+    ('subtask', 'status', STATUS_CODES),
+]
+
+
+def small_integer_field(codes, choices, **kwargs):
+    return api.models.fields.small_integer_choice_field.SmallIntegerChoiceField(
+        null=True, choices=choices, codes=codes, **kwargs)
+
+
+def copy_to_codes(apps, schema_editor):
+    for model_name, field, codes in CONVERTED_FIELDS:
+        model = apps.get_model('api', model_name)
+        for value in codes:
+            model.objects.filter(**{field: value}).update(**{field + '_code': value})
+
+
+def copy_from_codes(apps, schema_editor):
+    for model_name, field, codes in CONVERTED_FIELDS:
+        model = apps.get_model('api', model_name)
+        for value in codes:
+            model.objects.filter(**{field + '_code': value}).update(**{field: value})
+
+
+class Migration(migrations.Migration):
+    """
+    Moves Bug.status, Bug.priority, Task.status and SubTask.status from strings to small integer codes. The codes are
+    filled into new columns, the old columns are dropped and the new ones take their names. Task.status values outside
+    Status become NULL, which keeps those rows out of the active lists as before.
+    """
+
+    dependencies = [
+        ('api', '0014_owner_status_created_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(model_name='bug', name='bug_author_status_idx'),
+        migrations.RemoveIndex(model_name='subtask', name='subtask_task_status_idx'),
+        migrations.RemoveIndex(model_name='task', name='task_author_status_idx'),
+        migrations.AddField(
+            model_name='bug',
+            name='status_code',
+            field=small_integer_field(STATUS_CODES, STATUS_CHOICES),
+        ),
+        migrations.AddField(
+            model_name='bug',
+            name='priority_code',
+            field=small_integer_field(PRIORITY_CODES, PRIORITY_CHOICES),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='status_code',
+            field=small_integer_field(STATUS_CODES, STATUS_CHOICES),
+        ),
+        migrations.AddField(
+            model_name='subtask',
+            name='status_code',
+            field=small_integer_field(STATUS_CODES, STATUS_CHOICES),
+        ),
+        migrations.AlterField(
+            model_name='bug',
+            name='status',
+            field=models.CharField(null=True, max_length=10, choices=STATUS_CHOICES, default='NEW'),
+        ),
+        migrations.AlterField(
+            model_name='bug',
+            name='priority',
+            field=models.CharField(null=True, max_length=50, choices=PRIORITY_CHOICES),
+        ),
+        migrations.RunPython(copy_to_codes, copy_from_codes),
+        migrations.RemoveField(model_name='bug', name='status'),
+        migrations.RemoveField(model_name='bug', name='priority'),
+        migrations.RemoveField(model_name='task', name='status'),
+        migrations.RemoveField(model_name='subtask', name='status'),
+        migrations.RenameField(model_name='bug', old_name='status_code', new_name='status'),
+        migrations.RenameField(model_name='bug', old_name='priority_code', new_name='priority'),
+        migrations.RenameField(model_name='task', old_name='status_code', new_name='status'),
+        migrations.RenameField(model_name='subtask', old_name='status_code', new_name='status'),
+        migrations.AlterField(
+            model_name='bug',
+            name='status',
+            field=api.models.fields.small_integer_choice_field.SmallIntegerChoiceField(
+                choices=STATUS_CHOICES, codes=STATUS_CODES, default='NEW'),
+        ),
+        migrations.AlterField(
+            model_name='bug',
+            name='priority',
+            field=api.models.fields.small_integer_choice_field.SmallIntegerChoiceField(
+                choices=PRIORITY_CHOICES, codes=PRIORITY_CODES),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=small_integer_field(STATUS_CODES, STATUS_CHOICES, default='NEW'),
+        ),
+        migrations.AlterField(
+            model_name='subtask',
+            name='status',
+            field=small_integer_field(STATUS_CODES, STATUS_CHOICES, default='NEW'),
+        ),
+        migrations.AddIndex(
+            model_name='bug',
+            index=models.Index(fields=['author', 'status', '-created_at'], name='bug_author_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['task', 'status', '-created_at'], name='subtask_task_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['author', 'status', '-created_at'], name='task_author_status_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:14
+
+import api.models.fields.small_integer_choice_field
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_small_integer_status_priority'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BugArchive',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.CharField(max_length=1000)),
+                ('priority', api.models.fields.small_integer_choice_field.SmallIntegerChoiceField(choices=[('HIGH', 'High'), ('MEDIUM', 'Medium'), ('LOW', 'Low')], codes={'HIGH': 1, 'LOW': 3, 'MEDIUM': 2})),
+                ('status', api.models.fields.small_integer_choice_field.SmallIntegerChoiceField(choices=[('NEW', 'New'), ('UPDATED', 'Updated'), ('DELETED', 'Deleted')], codes={'DELETED': 3, 'NEW': 1, 'UPDATED': 2})),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['author', '-archived_at'], name='bugarchive_author_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SubTaskArchive',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('task_id', models.IntegerField()),
+                ('description', models.CharField(max_length=1000, null=True)),
+                ('status', api.models.fields.small_integer_choice_field.SmallIntegerChoiceField(choices=[('NEW', 'New'), ('UPDATED', 'Updated'), ('DELETED', 'Deleted')], codes={'DELETED': 3, 'NEW': 1, 'UPDATED': 2}, null=True)),
+                ('due_date', models.DateTimeField(null=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task_id', '-archived_at'], name='subtaskarchive_task_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskArchive',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('body', models.CharField(max_length=1000)),
+                ('status', api.models.fields.small_integer_choice_field.SmallIntegerChoiceField(choices=[('NEW', 'New'), ('UPDATED', 'Updated'), ('DELETED', 'Deleted')], codes={'DELETED': 3, 'NEW': 1, 'UPDATED': 2}, null=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['author', '-archived_at'], name='taskarchive_author_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,99 @@
+"""
+Cold storage for soft-deleted rows. archive_deleted moves DELETED bugs, tasks and subtasks here in chunks so the hot
+tables only hold live rows; archived rows keep their original ids and stay readable through the archive endpoints.
+"""
+
+from django.contrib.auth.models import User
+from django.db import models, transaction
+
+from api.models.bug_model import Bug
+from api.models.choices.priorities_choices import Priorities, PRIORITY_CODES
+from api.models.choices.status_choices import Status, STATUS_CODES
+from api.models.fields.small_integer_choice_field import SmallIntegerChoiceField
+from api.models.sub_task_model import SubTask
+from api.models.task_model import Task
+
+
+class ArchivedRow(models.Model):
+    id = models.IntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    # Concrete archives name the hot table they archive and define from_row(row), which builds the unsaved archive row.
+    source_model = None
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def archive(cls, queryset):
+        """
+        Locks the rows `queryset` matches, copies them into the archive and deletes them from the hot table in one
+        transaction. The filter is evaluated under the lock, so a row revived after the caller picked it is left alone,
+        and an interrupted run leaves every row in exactly one of the two tables and can simply be started again.
+        """
+        with transaction.atomic():
+            rows = list(queryset.select_for_update(of=('self',)))
+            cls.objects.bulk_create([cls.from_row(row) for row in rows], ignore_conflicts=True)
+            cls.source_model.objects.filter(pk__in=[row.pk for row in rows]).delete()
+        return len(rows)
+
+
+class BugArchive(ArchivedRow):
+    author = models.ForeignKey(User, on_delete=models.CASCADE)
+    title = models.CharField(max_length=100)
+    description = models.CharField(max_length=1000)
+    priority = SmallIntegerChoiceField(choices=Priorities.choices, codes=PRIORITY_CODES)
+    status = SmallIntegerChoiceField(choices=Status.choices, codes=STATUS_CODES)
+
+    source_model = Bug
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['author', '-archived_at'], name='bugarchive_author_idx'),
+        ]
+
+    @classmethod
+    def from_row(cls, bug):
+        return cls(id=bug.pk, author_id=bug.author_id, title=bug.title, description=bug.description,
+                   priority=bug.priority, status=bug.status, created_at=bug.created_at, updated_at=bug.updated_at)
+
+
+class TaskArchive(ArchivedRow):
+    author = models.ForeignKey(User, on_delete=models.CASCADE)
+    body = models.CharField(max_length=1000)
+    status = SmallIntegerChoiceField(null=True, choices=Status.choices, codes=STATUS_CODES)
+
+    source_model = Task
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['author', '-archived_at'], name='taskarchive_author_idx'),
+        ]
+
+    @classmethod
+    def from_row(cls, task):
+        return cls(id=task.pk, author_id=task.author_id, body=task.body, status=task.status,
+                   created_at=task.created_at, updated_at=task.updated_at)
+
+
+class SubTaskArchive(ArchivedRow):
+    task_id = models.IntegerField()
+    author = models.ForeignKey(User, on_delete=models.CASCADE)
+    description = models.CharField(null=True, max_length=1000)
+    status = SmallIntegerChoiceField(null=True, choices=Status.choices, codes=STATUS_CODES)
+    due_date = models.DateTimeField(null=True)
+
+    source_model = SubTask
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task_id', '-archived_at'], name='subtaskarchive_task_idx'),
+        ]
+
+    @classmethod
+    def from_row(cls, sub_task):
+        return cls(id=sub_task.pk, task_id=sub_task.task_id, author_id=sub_task.task.author_id,
+                   description=sub_task.description, status=sub_task.status, due_date=sub_task.due_date,
+                   created_at=sub_task.created_at, updated_at=sub_task.updated_at)
@@ -1,15 +1,22 @@
 from django.contrib.auth.models import User
 from django.db import models
 
-from api.models.choices.priorities_choices import Priorities
-from api.models.choices.status_choices import Status
+from api.models.choices.priorities_choices import Priorities, PRIORITY_CODES
+from api.models.choices.status_choices import Status, STATUS_CODES
+from api.models.fields.small_integer_choice_field import SmallIntegerChoiceField
 
 
 class Bug(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=100)
     description = models.CharField(max_length=1000)
-    priority = models.CharField(max_length=50, choices=Priorities.choices)
-    status = models.CharField(max_length=10, choices=Status.choices, default=Status.NEW)
+    priority = SmallIntegerChoiceField(choices=Priorities.choices, codes=PRIORITY_CODES)
+    status = SmallIntegerChoiceField(choices=Status.choices, codes=STATUS_CODES, default=Status.NEW)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['author', 'status', '-created_at'], name='bug_author_status_idx'),
+        ]
@@ -5,3 +5,6 @@ class Priorities(models.TextChoices):
     HIGH = "HIGH"
     MEDIUM = "MEDIUM"
     LOW = "LOW"
+
+
+PRIORITY_CODES = {Priorities.HIGH.value: 1, Priorities.MEDIUM.value: 2, Priorities.LOW.value: 3}
@@ -5,3 +5,8 @@ class Status(models.TextChoices):
     NEW = "NEW"
     UPDATED = "UPDATED"
     DELETED = "DELETED"
+
+
+ACTIVE_STATUSES = [Status.NEW, Status.UPDATED]
+
+STATUS_CODES = {Status.NEW.value: 1, Status.UPDATED.value: 2, Status.DELETED.value: 3}
@@ -0,0 +1,43 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.functional import cached_property
+
+
+class SmallIntegerChoiceField(models.SmallIntegerField):
+    """
+    Stores a text choice as a small integer code from `codes`. Models, querysets and serializers keep working with the
+    text values ("NEW", "HIGH"); only the column and the indexes that include it hold the code.
+    """
+
+    def __init__(self, *args, codes=None, **kwargs):
+        self.codes = dict(codes or {})
+        self.values_by_code = dict((code, value) for value, code in self.codes.items())
+        super(SmallIntegerChoiceField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(SmallIntegerChoiceField, self).deconstruct()
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        return list(self._validators)
+
+    def from_db_value(self, value, expression, connection):
+        return self.values_by_code.get(value, value)
+
+    def to_python(self, value):
+        if value is None or value in self.codes:
+            return value
+        if value in self.values_by_code:
+            return self.values_by_code[value]
+        raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value})
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or value in self.values_by_code:
+            return value
+        try:
+            return self.codes[value]
+        except (KeyError, TypeError):
+            raise ValueError("Field '%s' expected one of %s but got %r." % (self.name, ', '.join(self.codes), value))
@@ -1,18 +1,127 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+from functools import partial
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, connections, transaction
 from django.db.models import signals
 
+from api.models.user_stats_model import UserStats
+
+LAST_LOGIN_NOT_LOADED = object()
+
+logger = logging.getLogger(__name__)
+
 
 class LoginInfo(models.Model):
     user = models.ForeignKey(User, on_delete=models.PROTECT)
     timestamp = models.DateTimeField()
 
 
+class LoginInfoQueue:
+    """
+    Write-behind buffer used when LOGIN_INFO_RECORDING = 'write_behind'. Login events are queued once the login's
+    transaction commits and inserted with bulk_create by a background thread, every LOGIN_INFO_FLUSH_SECONDS or as soon
+    as LOGIN_INFO_FLUSH_SIZE events are pending, and on interpreter shutdown. Requests never write the batch themselves,
+    and a batch that fails to insert goes back to the queue for the next flush.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher = None
+
+    @property
+    def flush_size(self):
+        return getattr(settings, 'LOGIN_INFO_FLUSH_SIZE', 100)
+
+    @property
+    def flush_seconds(self):
+        return getattr(settings, 'LOGIN_INFO_FLUSH_SECONDS', 5)
+
+    def put(self, user_id, timestamp):
+        with self._lock:
+            self._pending.append(LoginInfo(user_id=user_id, timestamp=timestamp))
+            should_flush = len(self._pending) >= self.flush_size
+        self._start_flusher()
+        if should_flush:
+            self._wakeup.set()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            with transaction.atomic():
+                # Users deleted while their logins were queued would fail the whole batch on every retry.
+                users = set(User.objects.filter(pk__in={login_info.user_id for login_info in pending})
+                            .values_list('pk', flat=True))
+                pending = [login_info for login_info in pending if login_info.user_id in users]
+                LoginInfo.objects.bulk_create(pending, batch_size=self.flush_size)
+                for user_id, logins in Counter(login_info.user_id for login_info in pending).items():
+                    UserStats.increment(User(pk=user_id), total_logins=logins)
+        except Exception:
+            with self._lock:
+                self._pending[:0] = pending
+            raise
+        return len(pending)
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _start_flusher(self):
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._run_flusher, name='login-info-flusher', daemon=True)
+                    self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Failed to flush login events')
+            finally:
+                connections.close_all()
+
+
+login_info_queue = LoginInfoQueue()
+
+atexit.register(login_info_queue.flush)
+
+
+def user_post_init(sender, instance, **kwargs):
+    instance._loaded_last_login = instance.__dict__.get('last_login', LAST_LOGIN_NOT_LOADED)
+
+
 def user_pre_save(sender, instance, **kwargs):
-    if instance.last_login:
-        old = instance.__class__.objects.get(pk=instance.pk)
-        if instance.last_login != old.last_login:
-            instance.logininfo_set.create(timestamp=instance.last_login)
+    last_login = instance.__dict__.get('last_login')
+    if last_login and instance.pk:
+        loaded_last_login = instance._loaded_last_login
+        if loaded_last_login is LAST_LOGIN_NOT_LOADED:
+            loaded_last_login = instance.__class__.objects.filter(pk=instance.pk).values_list('last_login', flat=True).first()
+        if last_login != loaded_last_login:
+            if getattr(settings, 'LOGIN_INFO_RECORDING', 'sync') == 'write_behind':
+                transaction.on_commit(partial(login_info_queue.put, instance.pk, last_login))
+            else:
+                with transaction.atomic():
+                    instance.logininfo_set.create(timestamp=last_login)
+                    UserStats.increment(instance, total_logins=1)
+
+
+def user_post_save(sender, instance, **kwargs):
+    instance._loaded_last_login = instance.__dict__.get('last_login', LAST_LOGIN_NOT_LOADED)
 
 
+signals.post_init.connect(user_post_init, sender=User)
 signals.pre_save.connect(user_pre_save, sender=User)
+signals.post_save.connect(user_post_save, sender=User)
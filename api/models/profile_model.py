@@ -1,13 +1,15 @@
+"""
+The Profile model simply overrides any User (Django's default which is created. The purpose is to be able to add custom
+fields to the User data.
+The profile is created once together with its user and is not re-saved on every User save; save it explicitly when one of
+its own fields changes.
+"""
+
 from django.contrib.auth.models import User
 from django.db import models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-"""
-The Profile model simply overrides any User (Django's default which is created. The purpose is to be able to add custom 
-fields to the User data.  
-"""
-
 
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -16,7 +18,3 @@ class Profile(models.Model):
     def create_user_profile(sender, instance, created, **kwargs):
         if created:
             Profile.objects.create(user=instance)
-
-    @receiver(post_save, sender=User)
-    def save_user_profile(sender, instance, **kwargs):
-        instance.profile.save()
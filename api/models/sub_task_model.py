@@ -1,13 +1,29 @@
 from django.db import models
+from django.db.models import signals
 
-from api.models.choices.status_choices import Status
+from api.models.choices.status_choices import Status, STATUS_CODES, ACTIVE_STATUSES
+from api.models.fields.small_integer_choice_field import SmallIntegerChoiceField
 from api.models.task_model import Task
 
 
 class SubTask(models.Model):
     description = models.CharField(null=True, max_length=1000)
     task = models.ForeignKey(Task, on_delete=models.CASCADE)
-    status = models.CharField(max_length=10, null=True, choices=Status.choices, default=Status.NEW)
+    status = SmallIntegerChoiceField(null=True, choices=Status.choices, codes=STATUS_CODES, default=Status.NEW)
     due_date = models.DateTimeField(null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'status', '-created_at'], name='subtask_task_status_idx'),
+        ]
+
+
+def sub_task_post_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.status in ACTIVE_STATUSES:
+        Task.adjust_sub_tasks_count(instance.task_id, 1)
+
+
+signals.post_save.connect(sub_task_post_save, sender=SubTask)
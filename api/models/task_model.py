@@ -1,10 +1,28 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+from api.models.choices.status_choices import Status, STATUS_CODES
+from api.models.fields.small_integer_choice_field import SmallIntegerChoiceField
 
 
 class Task(models.Model):
     body = models.CharField(max_length=1000)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
-    status = models.CharField(max_length=10, null=True)
+    status = SmallIntegerChoiceField(null=True, choices=Status.choices, codes=STATUS_CODES, default=Status.NEW)
+    sub_tasks_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['author', 'status', '-created_at'], name='task_author_status_idx'),
+        ]
+
+    @staticmethod
+    def adjust_sub_tasks_count(task_id, delta):
+        if delta:
+            Task.objects.filter(pk=task_id).update(sub_tasks_count=F('sub_tasks_count') + delta,
+                                                   updated_at=timezone.now(), version=F('version') + 1)
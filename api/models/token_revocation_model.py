@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import signals
+from django.utils import timezone
+
+
+class TokenRevocation(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    revoked_at = models.DateTimeField(db_index=True)
+
+    @staticmethod
+    def revoke(user):
+        revocation, _ = TokenRevocation.objects.update_or_create(user=user, defaults={'revoked_at': timezone.now()})
+        return revocation
+
+
+# Signed tokens carry the superuser flag, so they are revoked when the user is deactivated or any privilege changes.
+PRIVILEGE_FIELDS = ('is_active', 'is_superuser', 'is_staff')
+
+
+def loaded_privileges(user):
+    return tuple(user.__dict__.get(field) for field in PRIVILEGE_FIELDS)
+
+
+def user_post_init(sender, instance, **kwargs):
+    instance._loaded_privileges = loaded_privileges(instance)
+
+
+def user_post_save(sender, instance, created, update_fields=None, **kwargs):
+    if created or getattr(settings, 'AUTH_TOKEN_MODE', 'db') != 'signed':
+        return
+    if update_fields is not None and not set(update_fields) & set(PRIVILEGE_FIELDS):
+        return
+    if not instance.is_active or loaded_privileges(instance) != instance._loaded_privileges:
+        TokenRevocation.revoke(instance)
+    instance._loaded_privileges = loaded_privileges(instance)
+
+
+signals.post_init.connect(user_post_init, sender=User)
+signals.post_save.connect(user_post_save, sender=User)
@@ -0,0 +1,96 @@
+"""
+Denormalized per-user counters read by ProfileSerializer. They are kept up to date with F() increments: on every
+single-row create by the post_save receivers below, and by the bulk and status-changing write paths and the login
+recorder; recompute_user_stats rebuilds them from the source tables and their archives.
+"""
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import models, transaction, IntegrityError
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from api.models.archive_model import BugArchive, TaskArchive, SubTaskArchive
+from api.models.bug_model import Bug
+from api.models.choices.status_choices import Status
+from api.models.sub_task_model import SubTask
+from api.models.task_model import Task
+
+
+def count_for_user(queryset, user_field):
+    counts = queryset.filter(**{user_field: OuterRef('pk')}).order_by().values(user_field).annotate(count=Count('pk'))
+    return Coalesce(Subquery(counts.values('count'), output_field=IntegerField()), 0)
+
+
+class UserStats(models.Model):
+    COUNTERS = ['total_bugs', 'active_bugs', 'total_tasks', 'total_subtasks', 'total_logins']
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    total_bugs = models.PositiveIntegerField(default=0)
+    active_bugs = models.PositiveIntegerField(default=0)
+    total_tasks = models.PositiveIntegerField(default=0)
+    total_subtasks = models.PositiveIntegerField(default=0)
+    total_logins = models.PositiveIntegerField(default=0)
+
+    @staticmethod
+    def with_computed_counters(users):
+        login_info = apps.get_model('api', 'LoginInfo')
+        return users.annotate(
+            computed_total_bugs=count_for_user(Bug.objects.all(), 'author') +
+            count_for_user(BugArchive.objects.all(), 'author'),
+            computed_active_bugs=count_for_user(Bug.objects.exclude(status=Status.DELETED), 'author'),
+            computed_total_tasks=count_for_user(Task.objects.all(), 'author') +
+            count_for_user(TaskArchive.objects.all(), 'author'),
+            computed_total_subtasks=count_for_user(SubTask.objects.all(), 'task__author') +
+            count_for_user(SubTaskArchive.objects.all(), 'author'),
+            computed_total_logins=count_for_user(login_info.objects.all(), 'user'),
+        )
+
+    @staticmethod
+    def recompute(user):
+        computed = UserStats.with_computed_counters(User.objects.filter(pk=user.pk)).values(
+            *['computed_' + counter for counter in UserStats.COUNTERS]).get()
+        stats, _ = UserStats.objects.update_or_create(
+            user_id=user.pk,
+            defaults=dict((counter, computed['computed_' + counter]) for counter in UserStats.COUNTERS))
+        return stats
+
+    @staticmethod
+    def increment(user, **deltas):
+        updates = dict((counter, F(counter) + delta) for counter, delta in deltas.items() if delta)
+        if not updates or UserStats.objects.filter(user_id=user.pk).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                UserStats.recompute(user)
+        except IntegrityError:
+            UserStats.objects.filter(user_id=user.pk).update(**updates)
+
+    @receiver(post_save, sender=User)
+    def create_user_stats(sender, instance, created, **kwargs):
+        if created:
+            UserStats.objects.create(user=instance)
+
+
+# Rows created one at a time, through the API, the admin or the ORM, are counted here; bulk_create skips signals, so
+# bulk write paths increment the counters themselves.
+
+@receiver(post_save, sender=Bug)
+def count_created_bug(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        UserStats.increment(User(pk=instance.author_id), total_bugs=1,
+                            active_bugs=int(instance.status != Status.DELETED))
+
+
+@receiver(post_save, sender=Task)
+def count_created_task(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        UserStats.increment(User(pk=instance.author_id), total_tasks=1)
+
+
+@receiver(post_save, sender=SubTask)
+def count_created_sub_task(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        UserStats.increment(User(pk=instance.task.author_id), total_subtasks=1)
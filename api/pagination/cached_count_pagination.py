@@ -0,0 +1,171 @@
+"""
+Page-number pagination whose `count` comes from a per-scope cache instead of a COUNT(*) on every page. Views name their
+scope with get_count_scope() and call invalidate_count_scope() after writing to it. On PostgreSQL, a cache miss first asks
+the planner for an estimate and only runs the exact count below APPROXIMATE_COUNT_THRESHOLD rows. Estimated counts are
+flagged with count_approximate in the response.
+
+Scopes are versioned like the list response cache, through get_cache_version() and bump_cache_version(), and cached
+counts are only used when cache_is_shared(): with a per-process cache, one worker's write would never reach the counts
+cached by the others.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+# Query parameters that never change which rows a list matches, only how much of them is returned.
+PAGINATION_QUERY_PARAMS = ('page', 'page_size', 'pagination', 'cursor', 'fields')
+
+
+def get_cache_version(key):
+    """
+    Current value of a version counter kept in the default cache. A missing counter is seeded from the clock in
+    nanoseconds instead of restarting at 1, so a counter evicted from the cache never hands out an old version again.
+    """
+    return cache.get_or_set(key, time.time_ns, None)
+
+
+def bump_cache_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, time.time_ns(), None):
+            cache.incr(key)
+
+
+def cache_is_shared():
+    """
+    Whether all workers use the same default cache, so that a version bumped by one worker's write reaches the others.
+    LocMemCache is per process and only counts when CACHE_SINGLE_PROCESS says the deployment runs a single process.
+    """
+    if isinstance(caches['default'], LocMemCache):
+        return getattr(settings, 'CACHE_SINGLE_PROCESS', False)
+    return True
+
+
+def count_scope_version_key(scope):
+    return 'count-version:%s' % scope
+
+
+def invalidate_count_scope(scope):
+    if scope is None:
+        return
+    bump_cache_version(count_scope_version_key(scope))
+
+
+def filter_params(request):
+    return sorted((key, value) for key, values in request.query_params.lists() for value in values
+                  if key not in PAGINATION_QUERY_PARAMS)
+
+
+def count_cache_key(scope, request):
+    version = get_cache_version(count_scope_version_key(scope))
+    params = filter_params(request)
+    digest = hashlib.md5(json.dumps(params).encode('utf-8')).hexdigest()
+    return 'count:%s:%s:%s' % (scope, version, digest)
+
+
+def planner_estimate(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    queryset = queryset.order_by()
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                           [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return row[0] if row and row[0] >= 0 else None
+    return int(json.loads(queryset.explain(format='json'))[0]['Plan']['Plan Rows'])
+
+
+class UnclampedPage(Page):
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super(UnclampedPage, self).__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class UnclampedPaginator(Paginator):
+    """
+    Paginator given a count it must not trust: the count may be cached or a planner estimate, so it is only reported.
+    Pages are sliced without clamping to it, one extra row tells whether there is a next page, and only a page with no
+    rows at all is out of range.
+    """
+
+    def __init__(self, object_list, per_page, count):
+        super(UnclampedPaginator, self).__init__(object_list, per_page)
+        self.count = count
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        return UnclampedPage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+
+class CachedCountPagination(PageNumberPagination):
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count, self.count_is_approximate = self.get_count(queryset, request, view)
+        return super(CachedCountPagination, self).paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        return UnclampedPaginator(object_list, per_page, self.count)
+
+    def get_count(self, queryset, request, view):
+        scope = view.get_count_scope() if hasattr(view, 'get_count_scope') else None
+        if scope is None:
+            return queryset.count(), False
+        if not cache_is_shared():
+            return self.count_rows(queryset)
+
+        key = count_cache_key(scope, request)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        count = self.count_rows(queryset)
+        cache.set(key, count, getattr(settings, 'PAGINATION_COUNT_CACHE_SECONDS', 300))
+        return count
+
+    @staticmethod
+    def count_rows(queryset):
+        estimate = planner_estimate(queryset)
+        if estimate is not None and estimate >= getattr(settings, 'APPROXIMATE_COUNT_THRESHOLD', 100000):
+            return estimate, True
+        return queryset.count(), False
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_approximate', self.count_is_approximate),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
@@ -0,0 +1,97 @@
+"""
+Cached-count page-number pagination by default, with an opt-in keyset mode selected by ?pagination=cursor. Keyset pages
+are ordered by (-created_at, -id) and seek past an opaque cursor instead of using OFFSET, and no COUNT(*) is run, so page
+N costs the same as page 1 and rows inserted while a client is paging never shift the following pages.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+from api.pagination.cached_count_pagination import CachedCountPagination
+
+
+class KeysetPagination(CachedCountPagination):
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = request.query_params.get(self.mode_query_param) == 'cursor'
+        if not self.keyset:
+            return super(KeysetPagination, self).paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        if cursor is None:
+            reverse = False
+            rows = list(queryset.order_by('-created_at', '-id')[:page_size + 1])
+        else:
+            created_at, pk, reverse = cursor
+            if reverse:
+                rows = list(queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+                                    .order_by('created_at', 'id')[:page_size + 1])
+            else:
+                rows = list(queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+                                    .order_by('-created_at', '-id')[:page_size + 1])
+
+        has_more = len(rows) > page_size
+        page = rows[:page_size]
+        if reverse:
+            page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = page
+        return page
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super(KeysetPagination, self).get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super(KeysetPagination, self).get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super(KeysetPagination, self).get_previous_link()
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        payload = json.dumps([row.created_at.isoformat(), row.pk, int(reverse)], separators=(',', ':'))
+        cursor = urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, pk, reverse = json.loads(urlsafe_b64decode(encoded.encode('ascii')).decode('ascii'))
+            created_at = parse_datetime(created_at)
+            if created_at is None:
+                raise ValueError
+            return created_at, int(pk), bool(reverse)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,127 @@
+"""
+Bulk provisioning of candidate users. Password hashing is the CPU-bound part of creating a user, so it is spread over a
+long-lived process pool; the users, their candidates group membership, profile and stats rows are then written with one
+bulk_create each, in one transaction.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from collections import namedtuple, Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, get_hasher
+from django.contrib.auth.models import User, Group
+from django.db import transaction, IntegrityError
+
+from api.models.profile_model import Profile
+from api.models.user_stats_model import UserStats
+from api.pagination.cached_count_pagination import invalidate_count_scope
+from api.serializers.user_serializer import UserSerializer
+
+CANDIDATES_GROUP = 'candidates'
+
+_hashing_pools = {}
+_hashing_pools_lock = threading.Lock()
+
+
+class UserImportError(Exception):
+
+    def __init__(self, errors):
+        super(UserImportError, self).__init__('Invalid users')
+        self.errors = errors
+
+
+class UserImportResult(namedtuple('UserImportResult', ['users', 'seconds'])):
+
+    @property
+    def users_per_second(self):
+        return len(self.users) / self.seconds if self.seconds else float(len(self.users))
+
+
+def get_hashing_pool(processes):
+    """
+    Returns the process pool for `processes` workers. The pool is started once per process with the spawn context and
+    reused by every import after it, so a request neither forks the web worker nor pays for starting the pool.
+    """
+    with _hashing_pools_lock:
+        if processes not in _hashing_pools:
+            _hashing_pools[processes] = ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup)
+        return _hashing_pools[processes]
+
+
+def discard_hashing_pool(processes, pool):
+    with _hashing_pools_lock:
+        if _hashing_pools.get(processes) is pool:
+            del _hashing_pools[processes]
+    pool.shutdown(wait=False)
+
+
+def hash_passwords(passwords, processes=None):
+    """
+    A pool whose worker died is broken for good, so it is discarded and the batch is hashed once more on a new pool.
+    """
+    processes = processes or getattr(settings, 'USER_IMPORT_PROCESSES', None) or os.cpu_count() or 1
+    hash_password = partial(make_password, salt=None, hasher=get_hasher())
+    if min(processes, len(passwords)) <= 1:
+        return [hash_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (processes * 4))
+    pool = get_hashing_pool(processes)
+    try:
+        return list(pool.map(hash_password, passwords, chunksize=chunksize))
+    except BrokenProcessPool:
+        discard_hashing_pool(processes, pool)
+    return list(get_hashing_pool(processes).map(hash_password, passwords, chunksize=chunksize))
+
+
+def validate_users(rows):
+    serializer = UserSerializer(data=rows, many=True, allow_empty=False)
+    if not serializer.is_valid():
+        raise UserImportError(serializer.errors)
+
+    users = serializer.validated_data
+    errors = username_errors(users)
+    if errors:
+        raise UserImportError(errors)
+    return users
+
+
+def username_errors(users):
+    repeated = Counter(user['username'] for user in users)
+    taken = set(User.objects.filter(username__in=list(repeated)).values_list('username', flat=True))
+    return dict((index, {'username': ['A user with that username already exists.']})
+                for index, user in enumerate(users)
+                if user['username'] in taken or repeated[user['username']] > 1)
+
+
+def import_users(rows, processes=None):
+    started = time.perf_counter()
+    validated = validate_users(rows)
+    passwords = hash_passwords([user['password'] for user in validated], processes)
+    group, _ = Group.objects.get_or_create(name=CANDIDATES_GROUP)
+
+    try:
+        users = create_users(validated, passwords, group)
+    except IntegrityError:
+        # A username taken by a concurrent request between validation and the insert
+        raise UserImportError(username_errors(validated) or {'non_field_errors': ['The users could not be created.']})
+    invalidate_count_scope('auth.user:all')
+    return UserImportResult(users, time.perf_counter() - started)
+
+
+def create_users(validated, passwords, group):
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(username=user['username'], email=user['email'], first_name=user['first_name'], password=password)
+            for user, password in zip(validated, passwords)])
+        User.groups.through.objects.bulk_create([User.groups.through(user_id=user.pk, group_id=group.pk)
+                                                 for user in users])
+        Profile.objects.bulk_create([Profile(user=user) for user in users])
+        UserStats.objects.bulk_create([UserStats(user=user) for user in users])
+    return users
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+from api.models.archive_model import BugArchive, TaskArchive, SubTaskArchive
+
+
+class BugArchiveSerializer(serializers.HyperlinkedModelSerializer):
+    class Meta:
+        model = BugArchive
+        fields = ['id', 'title', 'description', 'priority', 'status', 'created_at', 'archived_at']
+        read_only_fields = fields
+
+
+class TaskArchiveSerializer(serializers.HyperlinkedModelSerializer):
+    class Meta:
+        model = TaskArchive
+        fields = ['id', 'body', 'status', 'created_at', 'archived_at']
+        read_only_fields = fields
+
+
+class SubTaskArchiveSerializer(serializers.HyperlinkedModelSerializer):
+    class Meta:
+        model = SubTaskArchive
+        fields = ['id', 'task_id', 'description', 'status', 'due_date', 'created_at', 'archived_at']
+        read_only_fields = fields
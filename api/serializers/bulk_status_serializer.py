@@ -0,0 +1,10 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from api.models.choices.status_choices import Status
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False,
+                                max_length=getattr(settings, 'BULK_MAX_BATCH_SIZE', 500))
+    status = serializers.ChoiceField(choices=Status.choices)
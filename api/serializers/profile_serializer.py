@@ -1,6 +1,6 @@
-from django.db.models import Count
 from rest_framework import serializers
 
+from api.models.user_stats_model import UserStats
 from api.serializers.user_serializer import UserSerializer
 
 
@@ -14,13 +14,13 @@ class ProfileSerializer(UserSerializer):
     total_subtasks = serializers.SerializerMethodField(read_only=True)
 
     def get_total_bugs(self, user):
-        return user.bug_set.count()
+        return self._stats(user).total_bugs
 
     def get_active_bugs(self, user):
-        return user.bug_set.exclude(status="DELETED").count()
+        return self._stats(user).active_bugs
 
     def get_total_tasks(self, user):
-        return user.task_set.count()
+        return self._stats(user).total_tasks
 
     def get_last_login(self, user):
         return user.last_login
@@ -29,10 +29,18 @@ class ProfileSerializer(UserSerializer):
         return user.date_joined.__str__()
 
     def get_total_logins(self, user):
-        return user.logininfo_set.count()
+        return self._stats(user).total_logins
 
     def get_total_subtasks(self, user):
-        return user.task_set.all().aggregate(total_subtasks=Count('subtask'))['total_subtasks']
+        return self._stats(user).total_subtasks
+
+    @staticmethod
+    def _stats(user):
+        try:
+            return user.userstats
+        except UserStats.DoesNotExist:
+            user.userstats = UserStats.recompute(user)
+            return user.userstats
 
     class Meta(UserSerializer.Meta):
         profile_fields = ['active_bugs', 'total_bugs', 'total_tasks', 'last_login', 'date_joined', 'total_logins', 'total_subtasks']
@@ -5,10 +5,7 @@ from api.models.task_model import Task
 
 class TaskSerializer(serializers.HyperlinkedModelSerializer):
     body = serializers.CharField(min_length=3, max_length=250)
-    total_subtasks = serializers.SerializerMethodField()
-
-    def get_total_subtasks(self, task):
-        return task.subtask_set.count()
+    total_subtasks = serializers.IntegerField(source='sub_tasks_count', read_only=True)
 
     class Meta:
         model = Task
@@ -0,0 +1,132 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.utils import json
+
+from api.authentication.signed_token_authentication import SignedTokenAuthentication, deny_list, issue_signed_token, \
+    signer
+from api.models.token_revocation_model import TokenRevocation
+from api.tests.data_factory import FactoryData
+from api.views.token_view import TokenViewSet
+
+API_LOGIN = 'api/v1/login'
+
+
+@override_settings(AUTH_TOKEN_MODE='signed')
+class SignedTokenAuthenticationTest(TestCase):
+
+    def setUp(self):
+        deny_list.clear()
+
+    def test_login_returns_signed_token(self):
+        FactoryData.create_user_and_save('login_test')
+        data = {
+            'username': 'login_test',
+            'password': 'password',
+        }
+
+        request = RequestFactory().post(API_LOGIN, data=data, content_type='application/json')
+        resp = TokenViewSet.login(request)
+        token_response = json.loads(json.dumps(resp.data))
+        user, token = SignedTokenAuthentication().authenticate_credentials(token_response['token'])
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(token_response['userId'], user.pk)
+        self.assertGreater(token_response['seconds_to_expire'], 0)
+
+    def test_verify_without_database(self):
+        user = FactoryData.create_user('user', True)
+        token = issue_signed_token(user)
+        deny_list.refresh()
+
+        with self.assertNumQueries(0):
+            authenticated_user, auth = SignedTokenAuthentication().authenticate_credentials(token.key)
+
+        self.assertEqual(authenticated_user.pk, user.pk)
+        self.assertTrue(authenticated_user.is_superuser)
+        self.assertEqual(auth.key, token.key)
+
+    def test_tampered_token_is_rejected(self):
+        user = FactoryData.create_user()
+        token = issue_signed_token(user)
+        user_id, rest = token.key.split(signer.sep, 1)
+
+        with self.assertRaises(AuthenticationFailed):
+            SignedTokenAuthentication().authenticate_credentials(str(int(user_id) + 1) + signer.sep + rest)
+
+    def test_expired_token_is_rejected(self):
+        user = FactoryData.create_user()
+        now = int(time.time())
+        key = signer.sign('%d:0:%d:%d' % (user.pk, (now - 20) * 1000, now - 10))
+
+        with self.assertRaises(AuthenticationFailed):
+            SignedTokenAuthentication().authenticate_credentials(key)
+
+    def test_deactivated_user_token_is_revoked(self):
+        user = FactoryData.create_user()
+        token = issue_signed_token(user)
+        user.is_active = False
+        user.save()
+
+        self.assertTrue(TokenRevocation.objects.filter(user=user).exists())
+        with self.assertRaises(AuthenticationFailed):
+            SignedTokenAuthentication().authenticate_credentials(token.key)
+
+    def test_demoted_superuser_token_is_revoked(self):
+        user = FactoryData.create_user('root', root=True)
+        token = issue_signed_token(user)
+        user = User.objects.get(pk=user.pk)
+        user.is_superuser = False
+        user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            SignedTokenAuthentication().authenticate_credentials(token.key)
+
+    def test_promoted_staff_token_is_revoked(self):
+        user = FactoryData.create_user()
+        token = issue_signed_token(user)
+        User.objects.get(pk=user.pk).save()
+        self.assertFalse(TokenRevocation.objects.filter(user=user).exists())
+
+        user.is_staff = True
+        user.save(update_fields=['is_staff'])
+
+        self.assertTrue(TokenRevocation.objects.filter(user=user).exists())
+        with self.assertRaises(AuthenticationFailed):
+            SignedTokenAuthentication().authenticate_credentials(token.key)
+
+    def test_login_in_the_second_of_a_revocation(self):
+        user = FactoryData.create_user()
+        revoked_at = timezone.now().replace(microsecond=100000)
+        TokenRevocation.objects.create(user=user, revoked_at=revoked_at)
+        second = int(revoked_at.timestamp()) * 1000
+
+        with mock.patch('time.time_ns', return_value=(second + 50) * 1000000):
+            before = issue_signed_token(user)
+        with mock.patch('time.time_ns', return_value=(second + 500) * 1000000):
+            after = issue_signed_token(user)
+
+        with self.assertRaises(AuthenticationFailed):
+            SignedTokenAuthentication().authenticate_credentials(before.key)
+        self.assertEqual(SignedTokenAuthentication().authenticate_credentials(after.key)[0].pk, user.pk)
+
+    def test_stale_deny_list_is_refreshed_by_one_thread(self):
+        user = FactoryData.create_user()
+        token = issue_signed_token(user)
+        deny_list.refresh()
+        deny_list._refreshed_at -= deny_list.refresh_interval + 1
+
+        with deny_list._refresh_lock, self.assertNumQueries(0):
+            SignedTokenAuthentication().authenticate_credentials(token.key)
+        with self.assertNumQueries(1):
+            SignedTokenAuthentication().authenticate_credentials(token.key)
+
+    @override_settings(AUTH_TOKEN_MODE='db')
+    def test_signed_token_ignored_in_db_mode(self):
+        token = issue_signed_token(User(pk=1))
+
+        self.assertIsNone(SignedTokenAuthentication().authenticate_credentials(token.key))
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from api.authentication.expiring_token_authentication import ExpiringTokenAuthentication
+from api.authentication.token_cache import token_cache, TokenCache
+from api.tests.data_factory import FactoryData
+
+
+class TokenCacheTest(TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+
+    def test_authenticate_twice_hits_cache(self):
+        user = FactoryData.create_user()
+        token = FactoryData.create_token(user)
+        authentication = ExpiringTokenAuthentication()
+
+        authentication.authenticate_credentials(token.key)
+        with self.assertNumQueries(0):
+            cached_user, cached_token = authentication.authenticate_credentials(token.key)
+
+        self.assertEqual(cached_user, user)
+        self.assertEqual(cached_token.key, token.key)
+        self.assertEqual(token_cache.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+    def test_each_hit_gets_its_own_user(self):
+        user = FactoryData.create_user()
+        token = FactoryData.create_token(user)
+        authentication = ExpiringTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+
+        first_user, first_token = authentication.authenticate_credentials(token.key)
+        first_user.first_name = 'changed by a request'
+        second_user, second_token = authentication.authenticate_credentials(token.key)
+
+        self.assertIsNot(first_user, second_user)
+        self.assertIs(second_token.user, second_user)
+        self.assertEqual(second_user.first_name, user.first_name)
+
+    def test_deactivated_user_is_invalidated(self):
+        user = FactoryData.create_user()
+        token = FactoryData.create_token(user)
+        authentication = ExpiringTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+
+        user.is_active = False
+        user.save()
+
+        self.assertEqual(token_cache.stats()['size'], 0)
+        with self.assertRaises(AuthenticationFailed):
+            authentication.authenticate_credentials(token.key)
+
+    def test_deleted_token_is_invalidated(self):
+        user = FactoryData.create_user()
+        token = FactoryData.create_token(user)
+        authentication = ExpiringTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+
+        token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            authentication.authenticate_credentials(token.key)
+
+    def test_expired_token_is_not_cached(self):
+        user = FactoryData.create_user()
+        token = FactoryData.create_token(user)
+        Token.objects.filter(key=token.key).update(created=token.created - timedelta(days=1))
+
+        with self.assertRaises(AuthenticationFailed):
+            ExpiringTokenAuthentication().authenticate_credentials(token.key)
+
+        self.assertEqual(token_cache.stats()['size'], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TokenCache(max_size=2, ttl=60)
+        tokens = [FactoryData.create_token(FactoryData.create_user('user%d' % i)) for i in range(3)]
+        cache.set(tokens[0])
+        cache.set(tokens[1])
+        cache.get(tokens[0].key)
+        cache.set(tokens[2])
+
+        self.assertIsNotNone(cache.get(tokens[0].key))
+        self.assertIsNone(cache.get(tokens[1].key))
+        self.assertIsNotNone(cache.get(tokens[2].key))
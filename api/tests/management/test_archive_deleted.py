@@ -0,0 +1,74 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models.archive_model import BugArchive, TaskArchive, SubTaskArchive
+from api.models.bug_model import Bug
+from api.models.sub_task_model import SubTask
+from api.models.task_model import Task
+from api.models.user_stats_model import UserStats
+from api.tests.data_factory import FactoryData
+
+
+class ArchiveDeletedTest(TestCase):
+
+    def setUp(self):
+        self.user = FactoryData.create_user()
+        self.old_bugs = [FactoryData.create_bug(self.user, 'DELETED') for _ in range(3)]
+        self.recent_bug = FactoryData.create_bug(self.user, 'DELETED')
+        self.live_bug = FactoryData.create_bug(self.user)
+        self.task = FactoryData.create_task(self.user)
+        self.old_sub_task = FactoryData.create_sub_task(self.task, 'DELETED')
+        self.live_sub_task = FactoryData.create_sub_task(self.task)
+        self.old_task = FactoryData.create_task(self.user, 'DELETED')
+        self.orphan = FactoryData.create_sub_task(self.old_task)
+        long_ago = timezone.now() - timedelta(days=40)
+        Bug.objects.filter(pk__in=[bug.pk for bug in self.old_bugs]).update(updated_at=long_ago)
+        SubTask.objects.filter(pk=self.old_sub_task.pk).update(updated_at=long_ago)
+        Task.objects.filter(pk=self.old_task.pk).update(updated_at=long_ago)
+
+    def test_archive_old_deleted_rows(self):
+        out = StringIO()
+
+        call_command('archive_deleted', older_than_days=30, batch_size=2, stdout=out)
+
+        self.assertIn('Archived 3 bugs, 1 tasks and 2 subtasks', out.getvalue())
+        self.assertEqual(set(Bug.objects.values_list('pk', flat=True)), {self.recent_bug.pk, self.live_bug.pk})
+        self.assertEqual(set(BugArchive.objects.values_list('pk', flat=True)), set(bug.pk for bug in self.old_bugs))
+        self.assertEqual(BugArchive.objects.get(pk=self.old_bugs[0].pk).status, 'DELETED')
+        self.assertEqual(list(Task.objects.values_list('pk', flat=True)), [self.task.pk])
+        self.assertTrue(TaskArchive.objects.filter(pk=self.old_task.pk).exists())
+        self.assertEqual(list(SubTask.objects.values_list('pk', flat=True)), [self.live_sub_task.pk])
+        self.assertEqual(SubTaskArchive.objects.get(pk=self.orphan.pk).author, self.user)
+
+    def test_archive_skips_rows_revived_after_they_were_picked(self):
+        picked = Bug.objects.filter(pk=self.old_bugs[0].pk, status='DELETED')
+        Bug.objects.filter(pk=self.old_bugs[0].pk).update(status='NEW')
+
+        self.assertEqual(BugArchive.archive(picked), 0)
+        self.assertTrue(Bug.objects.filter(pk=self.old_bugs[0].pk).exists())
+        self.assertFalse(BugArchive.objects.filter(pk=self.old_bugs[0].pk).exists())
+
+    def test_archive_is_resumable(self):
+        call_command('archive_deleted', older_than_days=30, stdout=StringIO())
+        out = StringIO()
+
+        call_command('archive_deleted', older_than_days=30, stdout=out)
+
+        self.assertIn('Archived 0 bugs, 0 tasks and 0 subtasks', out.getvalue())
+
+    def test_user_stats_count_archived_rows(self):
+        call_command('archive_deleted', older_than_days=30, stdout=StringIO())
+        out = StringIO()
+
+        call_command('recompute_user_stats', dry_run=True, stdout=out)
+
+        self.assertIn('Checked 1 users, 0 drifted', out.getvalue())
+        stats = UserStats.recompute(self.user)
+        self.assertEqual(stats.total_bugs, 5)
+        self.assertEqual(stats.active_bugs, 1)
+        self.assertEqual(stats.total_tasks, 2)
+        self.assertEqual(stats.total_subtasks, 3)
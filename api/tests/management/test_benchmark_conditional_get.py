@@ -0,0 +1,19 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models.bug_model import Bug
+
+
+class BenchmarkConditionalGetTest(TestCase):
+
+    def test_reports_not_modified_share_and_rolls_back(self):
+        out = StringIO()
+
+        call_command('benchmark_conditional_get', bugs=20, polls=10, write_every=5, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], 'polls: 10')
+        self.assertEqual(lines[1], '304: 8 (80.0%)')
+        self.assertFalse(Bug.objects.exists())
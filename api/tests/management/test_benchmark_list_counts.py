@@ -0,0 +1,19 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models.bug_model import Bug
+
+
+class BenchmarkListCountsTest(TestCase):
+
+    def test_reports_each_size_and_rolls_back(self):
+        out = StringIO()
+
+        call_command('benchmark_list_counts', sizes=[20, 40], requests=1, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[2].split()[0], '40')
+        self.assertFalse(Bug.objects.exists())
@@ -0,0 +1,24 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models.bug_model import Bug
+
+
+class BenchmarkWritePathsTest(TestCase):
+
+    def test_reports_statements_per_action_and_rolls_back(self):
+        out = StringIO()
+
+        call_command('benchmark_write_paths', requests=3, stdout=out)
+
+        rows = dict(((line.split()[0], line.split()[1]), float(line.split()[3]))
+                    for line in out.getvalue().splitlines()[1:])
+        self.assertEqual(rows[('bugs', 'PATCH')], 2)
+        self.assertEqual(rows[('bugs', 'DELETE')], 2)
+        self.assertEqual(rows[('tasks', 'PATCH')], 2)
+        self.assertEqual(rows[('tasks', 'DELETE')], 1)
+        self.assertEqual(rows[('subtasks', 'PATCH')], 2)
+        self.assertEqual(rows[('subtasks', 'DELETE')], 2)
+        self.assertFalse(Bug.objects.exists())
@@ -0,0 +1,73 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from api.provisioning.user_import import _hashing_pools, get_hashing_pool, hash_passwords
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportUsersTest(TestCase):
+
+    def write_csv(self, rows):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, 'w', newline='') as target:
+            writer = csv.DictWriter(target, fieldnames=['username', 'email', 'name', 'password'])
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def test_import_csv_with_process_pool(self):
+        path = self.write_csv([{'username': 'candidate%d' % i, 'email': 'c%d@email.com' % i, 'name': 'Candidate',
+                                'password': 'secret%d' % i} for i in range(6)])
+        out = StringIO()
+
+        call_command('import_users', path, processes=2, batch_size=4, stdout=out)
+
+        self.assertIn('Imported 6 users', out.getvalue())
+        self.assertIn('users/sec', out.getvalue())
+        self.assertTrue(User.objects.get(username='candidate5').check_password('secret5'))
+
+    def test_batches_share_one_process_pool(self):
+        path = self.write_csv([{'username': 'candidate%d' % i, 'email': 'c%d@email.com' % i, 'name': 'Candidate',
+                                'password': 'secret%d' % i} for i in range(6)])
+        pools = []
+
+        def remember_pool(processes):
+            pools.append(get_hashing_pool(processes))
+            return pools[-1]
+
+        with mock.patch('api.provisioning.user_import.get_hashing_pool', side_effect=remember_pool):
+            call_command('import_users', path, processes=2, batch_size=3, stdout=StringIO())
+
+        self.assertEqual(len(pools), 2)
+        self.assertIs(pools[0], pools[1])
+
+    def test_broken_pool_is_replaced(self):
+        broken = mock.Mock(**{'map.side_effect': BrokenProcessPool})
+        with mock.patch.dict(_hashing_pools, {2: broken}):
+            hashes = hash_passwords(['secret0', 'secret1'], processes=2)
+            replacement = _hashing_pools[2]
+        self.addCleanup(replacement.shutdown)
+
+        self.assertIsNot(replacement, broken)
+        broken.shutdown.assert_called_once_with(wait=False)
+        self.assertTrue(check_password('secret1', hashes[1]))
+
+    def test_import_stops_at_invalid_batch(self):
+        path = self.write_csv([{'username': 'candidate', 'email': 'not-an-email', 'name': 'Candidate',
+                                'password': 'secret'}])
+
+        with self.assertRaises(CommandError):
+            call_command('import_users', path, processes=1, stdout=StringIO())
+
+        self.assertFalse(User.objects.filter(username='candidate').exists())
@@ -0,0 +1,23 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+
+from api.tests.data_factory import FactoryData
+
+
+class PurgeExpiredTokensTest(TestCase):
+
+    def test_purge_only_expired_tokens(self):
+        live_token = FactoryData.create_token(FactoryData.create_user('live'))
+        for i in range(5):
+            token = FactoryData.create_token(FactoryData.create_user('expired%d' % i))
+            Token.objects.filter(key=token.key).update(created=token.created - timedelta(days=1))
+        out = StringIO()
+
+        call_command('purge_expired_tokens', batch_size=2, stdout=out)
+
+        self.assertEqual(list(Token.objects.values_list('key', flat=True)), [live_token.key])
+        self.assertIn('Purged 5 expired tokens', out.getvalue())
@@ -0,0 +1,29 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models.task_model import Task
+from api.tests.data_factory import FactoryData
+
+
+class RepairSubTasksCountTest(TestCase):
+
+    def test_repair_drifted_counters(self):
+        user = FactoryData.create_user()
+        task = FactoryData.create_task(user)
+        FactoryData.create_sub_task(task)
+        FactoryData.create_sub_task(task, 'DELETED')
+        in_sync = FactoryData.create_task(user)
+        Task.objects.filter(pk=task.pk).update(sub_tasks_count=7)
+        drifted_at = Task.objects.get(pk=task.pk).updated_at
+        out = StringIO()
+
+        call_command('repair_sub_tasks_count', batch_size=1, stdout=out)
+
+        task.refresh_from_db()
+        in_sync.refresh_from_db()
+        self.assertEqual(task.sub_tasks_count, 1)
+        self.assertGreater(task.updated_at, drifted_at)
+        self.assertEqual(in_sync.sub_tasks_count, 0)
+        self.assertIn('Checked 2 tasks, repaired 1', out.getvalue())
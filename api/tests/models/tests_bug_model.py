@@ -1,4 +1,6 @@
 from django.contrib.auth.models import User
+from django.core import serializers
+from django.db import connection
 from django.test import TestCase
 
 from api.models.bug_model import Bug
@@ -16,6 +18,21 @@ class BugModelTest(TestCase):
         self.assertEqual(bug.priority, 'HIGH')
         self.assertEqual(bug.status, 'NEW')
 
+    def test_status_and_priority_stored_as_small_integers(self):
+        bug = self.create_bug(self.create_user())
+        Bug.objects.filter(pk=bug.pk).update(status='DELETED', priority='LOW')
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT status, priority FROM api_bug WHERE id = %s', [bug.pk])
+            self.assertEqual(cursor.fetchone(), (3, 3))
+        self.assertEqual(Bug.objects.values_list('status', 'priority').get(), ('DELETED', 'LOW'))
+        self.assertEqual(Bug.objects.filter(status__in=['NEW', 'DELETED']).count(), 1)
+        self.assertEqual(serializers.serialize('python', [Bug.objects.get()])[0]['fields']['priority'], 'LOW')
+
+    def test_unknown_status_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Bug.objects.filter(status='DEACTIVATE').count()
+
     @staticmethod
     def create_bug(user):
         return Bug.objects.create(title='Bug', description='description', priority='HIGH', status='NEW', author=user)
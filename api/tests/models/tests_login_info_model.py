@@ -0,0 +1,93 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.models.login_info_model import LoginInfo, login_info_queue
+from api.models.user_stats_model import UserStats
+
+
+class LoginInfoModelTest(TestCase):
+
+    def test_login_info_created_when_last_login_changes(self):
+        user = self.create_user()
+        user.last_login = timezone.now()
+
+        with self.assertNumQueries(5):
+            user.save(update_fields=['last_login'])
+
+        self.assertEqual(LoginInfo.objects.filter(user=user).count(), 1)
+
+    def test_login_info_not_created_when_last_login_unchanged(self):
+        user = self.create_user()
+        user.last_login = timezone.now()
+        user.save()
+        user = User.objects.get(pk=user.pk)
+        user.first_name = 'name'
+        user.save()
+
+        self.assertEqual(LoginInfo.objects.filter(user=user).count(), 1)
+
+    def test_login_info_with_deferred_last_login(self):
+        user = self.create_user()
+        user = User.objects.only('username').get(pk=user.pk)
+        user.last_login = timezone.now()
+        user.save()
+
+        self.assertEqual(LoginInfo.objects.filter(user=user).count(), 1)
+
+    @override_settings(LOGIN_INFO_RECORDING='write_behind', LOGIN_INFO_FLUSH_SIZE=3, LOGIN_INFO_FLUSH_SECONDS=3600)
+    def test_login_info_write_behind(self):
+        login_info_queue.flush()
+        user = self.create_user()
+        with mock.patch.object(login_info_queue, '_start_flusher'), self.captureOnCommitCallbacks(execute=True):
+            for _ in range(2):
+                user.last_login = timezone.now()
+                user.save(update_fields=['last_login'])
+        self.assertEqual(login_info_queue.pending(), 2)
+        self.assertFalse(login_info_queue._wakeup.is_set())
+
+        user.last_login = timezone.now()
+        with mock.patch.object(login_info_queue, '_start_flusher'), self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                user.save(update_fields=['last_login'])
+
+        self.assertTrue(login_info_queue._wakeup.is_set())
+        self.assertEqual(LoginInfo.objects.filter(user=user).count(), 0)
+        login_info_queue._wakeup.clear()
+        self.assertEqual(login_info_queue.flush(), 3)
+        self.assertEqual(LoginInfo.objects.filter(user=user).count(), 3)
+        self.assertEqual(UserStats.objects.get(user=user).total_logins, 3)
+
+    @override_settings(LOGIN_INFO_RECORDING='write_behind')
+    def test_login_info_write_behind_skips_rolled_back_logins(self):
+        login_info_queue.flush()
+        user = self.create_user()
+        with mock.patch.object(login_info_queue, '_start_flusher'), self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                user.last_login = timezone.now()
+                user.save(update_fields=['last_login'])
+                raise DatabaseError
+
+        self.assertEqual(login_info_queue.pending(), 0)
+
+    def test_failed_flush_keeps_the_batch(self):
+        login_info_queue.flush()
+        user = self.create_user()
+        with mock.patch.object(login_info_queue, '_start_flusher'):
+            login_info_queue.put(user.pk, timezone.now())
+            login_info_queue.put(user.pk, timezone.now())
+
+        with mock.patch.object(LoginInfo.objects, 'bulk_create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                login_info_queue.flush()
+
+        self.assertEqual(login_info_queue.pending(), 2)
+        self.assertEqual(login_info_queue.flush(), 2)
+        self.assertEqual(LoginInfo.objects.filter(user=user).count(), 2)
+
+    @staticmethod
+    def create_user():
+        return User.objects.create(username='username', password='password', email='email')
@@ -0,0 +1,53 @@
+from django.db import connection
+from django.test import TestCase
+
+from api.models.bug_model import Bug
+from api.models.choices.status_choices import ACTIVE_STATUSES
+from api.models.sub_task_model import SubTask
+from api.models.task_model import Task
+from api.tests.data_factory import FactoryData
+
+
+class OwnerStatusIndexQueryPlanTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = FactoryData.create_user()
+        other = FactoryData.create_user('other')
+        cls.task = FactoryData.create_task(cls.user)
+        for author in (cls.user, other):
+            for status in ('NEW', 'UPDATED', 'DELETED') * 20:
+                FactoryData.create_bug(author, status)
+                FactoryData.create_task(author, status)
+                FactoryData.create_sub_task(cls.task, status)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+            try:
+                plan = queryset.explain()
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute('RESET enable_seqscan')
+        else:
+            plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_bug_list_uses_owner_status_index(self):
+        queryset = Bug.objects.filter(author=self.user, status__in=ACTIVE_STATUSES).order_by('-created_at')
+
+        self.assertUsesIndex(queryset, 'bug_author_status_idx')
+        self.assertUsesIndex(queryset.order_by(), 'bug_author_status_idx')
+
+    def test_task_list_uses_owner_status_index(self):
+        queryset = Task.objects.filter(author=self.user, status__in=ACTIVE_STATUSES).order_by('-created_at')
+
+        self.assertUsesIndex(queryset, 'task_author_status_idx')
+
+    def test_sub_task_list_uses_task_status_index(self):
+        queryset = SubTask.objects.filter(task=self.task, status__in=ACTIVE_STATUSES).order_by('-created_at')
+
+        self.assertUsesIndex(queryset, 'subtask_task_status_idx')
@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models.bug_model import Bug
+from api.models.sub_task_model import SubTask
+from api.models.task_model import Task
+from api.models.user_stats_model import UserStats
+
+
+class UserStatsModelTest(TestCase):
+
+    def test_user_stats_created_with_user(self):
+        user = self.create_user()
+
+        self.assertEqual(UserStats.objects.get(user=user).total_bugs, 0)
+
+    def test_increment(self):
+        user = self.create_user()
+
+        UserStats.increment(user, total_bugs=2, active_bugs=1)
+
+        stats = UserStats.objects.get(user=user)
+        self.assertEqual(stats.total_bugs, 2)
+        self.assertEqual(stats.active_bugs, 1)
+
+    def test_increment_recomputes_missing_row(self):
+        user = self.create_user()
+        UserStats.objects.filter(user=user).delete()
+        self.create_bug(user)
+
+        UserStats.increment(user, total_bugs=1, active_bugs=1)
+
+        stats = UserStats.objects.get(user=user)
+        self.assertEqual(stats.total_bugs, 1)
+        self.assertEqual(stats.active_bugs, 1)
+
+    def test_recompute_user_stats_reports_and_fixes_drift(self):
+        user = self.create_user()
+        self.create_bug(user)
+        self.create_bug(user, 'DELETED')
+        other = User.objects.create(username='other', password='password', email='email')
+        UserStats.objects.filter(user=other).delete()
+        out = StringIO()
+
+        call_command('recompute_user_stats', batch_size=1, stdout=out)
+
+        stats = UserStats.objects.get(user=user)
+        self.assertEqual(stats.total_bugs, 2)
+        self.assertEqual(stats.active_bugs, 1)
+        self.assertTrue(UserStats.objects.filter(user=other).exists())
+        self.assertIn('Checked 2 users, 2 drifted', out.getvalue())
+        self.assertIn('total_bugs: 1', out.getvalue())
+
+    def test_recompute_user_stats_dry_run(self):
+        user = self.create_user()
+        self.create_bug(user)
+
+        call_command('recompute_user_stats', dry_run=True, stdout=StringIO())
+
+        self.assertEqual(UserStats.objects.get(user=user).total_bugs, 0)
+
+    def test_single_row_creates_update_counters(self):
+        user = self.create_user()
+        Bug.objects.create(title='Bug', description='description', priority='HIGH', status='NEW', author=user)
+        Bug.objects.create(title='Bug', description='description', priority='HIGH', status='DELETED', author=user)
+        task = Task.objects.create(body='Task body message', author=user)
+        SubTask.objects.create(description='Sub task', task=task)
+        SubTask.objects.create(description='Sub task', task=task, status='DELETED')
+
+        stats = UserStats.objects.get(user=user)
+        self.assertEqual((stats.total_bugs, stats.active_bugs, stats.total_tasks, stats.total_subtasks), (2, 1, 1, 2))
+        self.assertEqual(Task.objects.get(pk=task.pk).sub_tasks_count, 1)
+
+    @staticmethod
+    def create_bug(user, status='NEW'):
+        # bulk_create skips the counting signals, leaving the counters drifted for recompute to find.
+        return Bug.objects.bulk_create([
+            Bug(title='Bug', description='description', priority='HIGH', status=status, author=user)])[0]
+
+    @staticmethod
+    def create_user():
+        return User.objects.create(username='username', password='password', email='email')
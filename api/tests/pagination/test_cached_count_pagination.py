@@ -0,0 +1,149 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from rest_framework.test import force_authenticate
+
+from api.models.bug_model import Bug
+from api.pagination.cached_count_pagination import count_scope_version_key
+from api.tests.data_factory import FactoryData
+from api.views.bug_view import BugViewSet
+from api.views.conditional_view import ConditionalGetMixin
+from api.views.user_view import UserViewSet
+
+API_BUGS = 'api/v1/bugs'
+API_USERS = 'api/v1/users'
+
+
+class UnconditionalBugViewSet(BugViewSet):
+    # Skips the ETag aggregate, so the queries counted below are the pagination's alone.
+
+    def list(self, request, *args, **kwargs):
+        return super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                   CACHE_SINGLE_PROCESS=True)
+class CachedCountPaginationTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = FactoryData.create_user()
+        self.token = FactoryData.create_token(self.user)
+        for _ in range(15):
+            FactoryData.create_bug(self.user)
+
+    def request(self, method, url, user, data=None):
+        request = getattr(RequestFactory(), method)(url, data or {})
+        force_authenticate(request, user=user)
+        return request
+
+    def list_bugs(self, params=None, viewset=BugViewSet):
+        return viewset.as_view({'get': 'list'})(self.request('get', API_BUGS, self.user, params))
+
+    def test_count_is_served_from_cache(self):
+        with self.assertNumQueries(2):
+            first = self.list_bugs(viewset=UnconditionalBugViewSet)
+        with self.assertNumQueries(1):
+            second = self.list_bugs({'page': 2}, viewset=UnconditionalBugViewSet)
+
+        self.assertEqual(first.data['count'], 15)
+        self.assertEqual(second.data['count'], 15)
+        self.assertFalse(second.data['count_approximate'])
+        self.assertEqual(len(second.data['results']), 5)
+
+    def test_writes_invalidate_count(self):
+        self.list_bugs()
+        BugViewSet.as_view({'post': 'create'})(
+            self.request('post', API_BUGS, self.user, {'title': 'Bug', 'description': 'd', 'priority': 'LOW'}))
+        bug = self.list_bugs().data['results'][0]
+        self.assertEqual(self.list_bugs().data['count'], 16)
+
+        BugViewSet.as_view({'delete': 'destroy'})(self.request('delete', API_BUGS, self.user), pk=bug['id'])
+
+        self.assertEqual(self.list_bugs().data['count'], 15)
+
+    def test_evicted_scope_version_is_not_reused(self):
+        self.list_bugs(viewset=UnconditionalBugViewSet)
+        cache.delete(count_scope_version_key('api.bug:author=%d' % self.user.pk))
+        FactoryData.create_bug(self.user)
+
+        self.assertEqual(self.list_bugs(viewset=UnconditionalBugViewSet).data['count'], 16)
+
+    @override_settings(CACHE_SINGLE_PROCESS=False)
+    def test_process_local_cache_is_not_used_for_counts(self):
+        self.list_bugs(viewset=UnconditionalBugViewSet)
+
+        with self.assertNumQueries(2):
+            self.list_bugs({'page': 2}, viewset=UnconditionalBugViewSet)
+
+    def test_scopes_are_per_owner(self):
+        self.list_bugs()
+        other = FactoryData.create_user('other')
+        FactoryData.create_bug(other)
+
+        resp = BugViewSet.as_view({'get': 'list'})(self.request('get', API_BUGS, other))
+
+        self.assertEqual(resp.data['count'], 1)
+
+    @override_settings(APPROXIMATE_COUNT_THRESHOLD=1000)
+    def test_planner_estimate_above_threshold(self):
+        with mock.patch('api.pagination.cached_count_pagination.planner_estimate', return_value=250000):
+            with self.assertNumQueries(1):
+                resp = self.list_bugs(viewset=UnconditionalBugViewSet)
+
+        self.assertEqual(resp.data['count'], 250000)
+        self.assertTrue(resp.data['count_approximate'])
+
+    @override_settings(APPROXIMATE_COUNT_THRESHOLD=1000)
+    def test_planner_estimate_below_threshold(self):
+        with mock.patch('api.pagination.cached_count_pagination.planner_estimate', return_value=20):
+            resp = self.list_bugs(viewset=UnconditionalBugViewSet)
+
+        self.assertEqual(resp.data['count'], 15)
+        self.assertFalse(resp.data['count_approximate'])
+
+    def test_stale_cached_count_does_not_cut_pages(self):
+        self.list_bugs(viewset=UnconditionalBugViewSet)
+        Bug.objects.bulk_create([Bug(title='Bug', description='d', priority='LOW', author=self.user)
+                                 for _ in range(10)])
+
+        second = self.list_bugs({'page': 2}, viewset=UnconditionalBugViewSet)
+        third = self.list_bugs({'page': 3}, viewset=UnconditionalBugViewSet)
+
+        self.assertEqual(second.data['count'], 15)
+        self.assertEqual(len(second.data['results']), 10)
+        self.assertIsNotNone(second.data['next'])
+        self.assertEqual(len(third.data['results']), 5)
+        self.assertIsNone(third.data['next'])
+
+    @override_settings(APPROXIMATE_COUNT_THRESHOLD=5)
+    def test_pages_past_an_underestimate(self):
+        with mock.patch('api.pagination.cached_count_pagination.planner_estimate', return_value=8):
+            second = self.list_bugs({'page': 2}, viewset=UnconditionalBugViewSet)
+            beyond = self.list_bugs({'page': 3}, viewset=UnconditionalBugViewSet)
+
+        self.assertEqual(second.data['count'], 8)
+        self.assertTrue(second.data['count_approximate'])
+        self.assertEqual(len(second.data['results']), 5)
+        self.assertEqual(beyond.status_code, 404)
+
+    def test_superuser_user_list_invalidated_by_signup(self):
+        root = FactoryData.create_user('root', root=True)
+        list_users = UserViewSet.as_view({'get': 'list'})
+        self.assertEqual(list_users(self.request('get', API_USERS, root)).data['count'], 2)
+
+        UserViewSet.as_view({'post': 'create'})(self.request('post', API_USERS, None, {
+            'username': 'new', 'email': 'new@example.com', 'name': 'New', 'password': 'password'}))
+
+        self.assertEqual(list_users(self.request('get', API_USERS, root)).data['count'], 3)
+        self.assertEqual(list_users(self.request('get', API_USERS, root, {'search': 'root'})).data['count'], 1)
+
+    def test_conditional_list_uses_the_cached_count(self):
+        with self.assertNumQueries(3):
+            self.list_bugs()
+        with self.assertNumQueries(2):
+            resp = self.list_bugs({'page': 2})
+
+        self.assertEqual(resp.data['count'], 15)
+        self.assertEqual(len(resp.data['results']), 5)
@@ -0,0 +1,53 @@
+from django.test import TestCase, RequestFactory
+from rest_framework.test import force_authenticate
+
+from api.tests.data_factory import FactoryData
+from api.views.bug_view import BugViewSet
+
+API_BUGS = 'api/v1/bugs'
+
+
+class KeysetPaginationTest(TestCase):
+
+    def setUp(self):
+        self.user = FactoryData.create_user()
+        self.token = FactoryData.create_token(self.user)
+        self.bugs = [FactoryData.create_bug(self.user) for _ in range(25)]
+
+    def get(self, url, params=None):
+        request = RequestFactory().get(url, params or {}, HTTP_AUTHORIZATION=self.token.key)
+        force_authenticate(request, user=self.user, token=self.token)
+        return BugViewSet.as_view({'get': 'list'})(request)
+
+    def test_page_number_is_default(self):
+        resp = self.get(API_BUGS)
+
+        self.assertEqual(resp.data['count'], 25)
+        self.assertEqual(len(resp.data['results']), 10)
+
+    def test_walk_pages_with_cursor(self):
+        resp = self.get(API_BUGS, {'pagination': 'cursor'})
+        ids = [bug['id'] for bug in resp.data['results']]
+        self.assertNotIn('count', resp.data)
+        self.assertIsNone(resp.data['previous'])
+
+        FactoryData.create_bug(self.user)
+        while resp.data['next']:
+            with self.assertNumQueries(2):
+                resp = self.get(resp.data['next'])
+            ids += [bug['id'] for bug in resp.data['results']]
+
+        self.assertEqual(ids, [bug.id for bug in reversed(self.bugs)])
+
+    def test_previous_cursor(self):
+        first = self.get(API_BUGS, {'pagination': 'cursor'})
+        second = self.get(first.data['next'])
+        back = self.get(second.data['previous'])
+
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertIsNotNone(back.data['next'])
+
+    def test_invalid_cursor(self):
+        resp = self.get(API_BUGS, {'pagination': 'cursor', 'cursor': 'garbage'})
+
+        self.assertEqual(resp.status_code, 404)
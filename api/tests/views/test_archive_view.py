@@ -0,0 +1,101 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework.test import force_authenticate
+
+from api.models.bug_model import Bug
+from api.models.sub_task_model import SubTask
+from api.models.task_model import Task
+from api.tests.data_factory import FactoryData
+from api.views.bug_view import BugViewSet
+from api.views.sub_task_view import SubTaskViewSet
+
+API_BUGS_ARCHIVE = 'api/v1/bugs/archive'
+
+
+class ArchiveViewTest(TestCase):
+
+    def setUp(self):
+        self.user = FactoryData.create_user()
+        self.token = FactoryData.create_token(self.user)
+        self.bug = FactoryData.create_bug(self.user, 'DELETED')
+        self.task = FactoryData.create_task(self.user)
+        self.sub_task = FactoryData.create_sub_task(self.task, 'DELETED')
+        long_ago = timezone.now() - timedelta(days=40)
+        Bug.objects.update(updated_at=long_ago)
+        SubTask.objects.update(updated_at=long_ago)
+        call_command('archive_deleted', stdout=StringIO())
+
+    def get(self, view, user, **kwargs):
+        request = RequestFactory().get(API_BUGS_ARCHIVE)
+        force_authenticate(request, user=user)
+        return view(request, **kwargs)
+
+    def test_list_archived_bugs(self):
+        resp = self.get(BugViewSet.as_view({'get': 'archive'}), self.user)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['count'], 1)
+        self.assertEqual(resp.data['results'][0]['id'], self.bug.pk)
+        self.assertEqual(resp.data['results'][0]['status'], 'DELETED')
+
+    def test_retrieve_archived_bug(self):
+        resp = self.get(BugViewSet.as_view({'get': 'archived'}), self.user, archive_pk=self.bug.pk)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['title'], self.bug.title)
+
+    def test_retrieve_archived_bug_from_another_user(self):
+        other = FactoryData.create_user('other')
+
+        resp = self.get(BugViewSet.as_view({'get': 'archived'}), other, archive_pk=self.bug.pk)
+
+        self.assertEqual(resp.status_code, 404)
+
+    def test_archived_bug_is_gone_from_live_routes(self):
+        resp = self.get(BugViewSet.as_view({'get': 'retrieve'}), self.user, pk=self.bug.pk)
+
+        self.assertEqual(resp.status_code, 404)
+
+    def test_list_archived_sub_tasks(self):
+        resp = self.get(SubTaskViewSet.as_view({'get': 'archive'}), self.user, task_pk=self.task.pk)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([sub_task['id'] for sub_task in resp.data['results']], [self.sub_task.pk])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                       CACHE_SINGLE_PROCESS=True)
+    def test_archived_sub_tasks_have_their_own_count(self):
+        cache.clear()
+        for _ in range(3):
+            FactoryData.create_sub_task(self.task)
+        live = self.get(SubTaskViewSet.as_view({'get': 'list'}), self.user, task_pk=self.task.pk)
+
+        resp = self.get(SubTaskViewSet.as_view({'get': 'archive'}), self.user, task_pk=self.task.pk)
+
+        self.assertEqual(live.data['count'], 3)
+        self.assertEqual(resp.data['count'], 1)
+        self.assertEqual(len(resp.data['results']), 1)
+
+    def test_list_archived_sub_tasks_of_archived_task(self):
+        task = FactoryData.create_task(self.user, 'DELETED')
+        sub_task = FactoryData.create_sub_task(task)
+        Task.objects.filter(pk=task.pk).update(updated_at=timezone.now() - timedelta(days=40))
+        call_command('archive_deleted', stdout=StringIO())
+
+        resp = self.get(SubTaskViewSet.as_view({'get': 'archive'}), self.user, task_pk=task.pk)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([row['id'] for row in resp.data['results']], [sub_task.pk])
+
+    def test_list_archived_sub_tasks_from_another_user(self):
+        other = FactoryData.create_user('other')
+
+        resp = self.get(SubTaskViewSet.as_view({'get': 'archive'}), other, task_pk=self.task.pk)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['results'], [])
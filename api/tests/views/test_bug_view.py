@@ -1,15 +1,24 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
 from django.contrib.auth.models import AnonymousUser
-from django.test import TestCase, RequestFactory
+from django.test import TestCase, RequestFactory, override_settings
 from rest_framework.test import force_authenticate
 from rest_framework.utils import json
 from django.core import serializers
+from django.core.management import call_command
+from django.utils import timezone
 
 from api.models.bug_model import Bug
 from api.models.choices.status_choices import Status
+from api.models.user_stats_model import UserStats
 from api.tests.data_factory import FactoryData
 from api.views.bug_view import BugViewSet
 
 API_BUGS = 'api/v1/bugs'
+API_BUGS_BULK = 'api/v1/bugs/bulk'
+API_BUGS_BULK_STATUS = 'api/v1/bugs/bulk/status'
 
 
 class BugViewTest(TestCase):
@@ -255,4 +264,277 @@ class BugViewTest(TestCase):
 
         self.assertEqual(resp.status_code, 403)
 
+    def test_bug_actions_query_count(self):
+        user = FactoryData.create_user(False)
+        bug = FactoryData.create_bug(user)
+        token = FactoryData.create_token(user)
+        data = {
+                'title': 'Bug',
+                'description': 'description',
+                'priority': 'LOW'
+        }
+
+        request = RequestFactory().get(API_BUGS, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(3):
+            BugViewSet.as_view({'get': 'list'})(request)
+        with self.assertNumQueries(1):
+            BugViewSet.as_view({'get': 'retrieve'})(request, pk=bug.id)
+
+        request = RequestFactory().post(API_BUGS, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(4):
+            BugViewSet.as_view({'post': 'create'})(request)
+
+        request = RequestFactory().patch(API_BUGS, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(2):
+            BugViewSet.as_view({'patch': 'partial_update'})(request, pk=bug.id)
+
+        request = RequestFactory().delete(API_BUGS, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(2):
+            BugViewSet.as_view({'delete': 'destroy'})(request, pk=bug.id)
+
+    def test_create_and_delete_bug_update_user_stats(self):
+        user = FactoryData.create_user(False)
+        token = FactoryData.create_token(user)
+        data = {
+                'title': 'Bug',
+                'description': 'description',
+                'priority': 'LOW'
+        }
+
+        request = RequestFactory().post(API_BUGS, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        resp = BugViewSet.as_view({'post': 'create'})(request)
+        request = RequestFactory().delete(API_BUGS, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        BugViewSet.as_view({'delete': 'destroy'})(request, pk=resp.data['id'])
+        BugViewSet.as_view({'delete': 'destroy'})(request, pk=resp.data['id'])
+        stats = UserStats.objects.get(user=user)
+
+        self.assertEqual(stats.total_bugs, 1)
+        self.assertEqual(stats.active_bugs, 0)
+
+    def test_bulk_create_bugs(self):
+        user = FactoryData.create_user(False)
+        token = FactoryData.create_token(user)
+        data = [{'title': 'Bug %d' % i, 'description': 'description', 'priority': 'LOW'} for i in range(3)]
+
+        request = RequestFactory().post(API_BUGS_BULK, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(4):
+            resp = BugViewSet.as_view({'post': 'bulk'})(request)
+
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual([bug['title'] for bug in resp.data], ['Bug 0', 'Bug 1', 'Bug 2'])
+        self.assertEqual(list(Bug.objects.filter(author=user, status=Status.NEW).order_by('pk').values_list('pk', flat=True)),
+                         [bug['id'] for bug in resp.data])
+        stats = UserStats.objects.get(user=user)
+        self.assertEqual((stats.total_bugs, stats.active_bugs), (3, 3))
+
+    def test_bulk_create_bugs_with_invalid_item(self):
+        user = FactoryData.create_user(False)
+        token = FactoryData.create_token(user)
+        data = [{'title': 'Bug', 'description': 'description', 'priority': 'LOW'},
+                {'title': 'Bug', 'description': 'description', 'priority': 'cpriority'}]
+
+        request = RequestFactory().post(API_BUGS_BULK, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        resp = BugViewSet.as_view({'post': 'bulk'})(request)
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(list(resp.data['errors']), [1])
+        self.assertIn('priority', resp.data['errors'][1])
+        self.assertFalse(Bug.objects.exists())
+
+    @override_settings(BULK_MAX_BATCH_SIZE=2)
+    def test_bulk_create_bugs_over_max_size(self):
+        user = FactoryData.create_user(False)
+        token = FactoryData.create_token(user)
+        data = [{'title': 'Bug', 'description': 'description', 'priority': 'LOW'}] * 3
+
+        request = RequestFactory().post(API_BUGS_BULK, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        resp = BugViewSet.as_view({'post': 'bulk'})(request)
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(Bug.objects.exists())
+
+    def test_bulk_create_bugs_without_token(self):
+        request = RequestFactory().post(API_BUGS_BULK, data=[], content_type='application/json')
+        request.user = AnonymousUser()
+        resp = BugViewSet.as_view({'post': 'bulk'})(request)
+
+        self.assertEqual(resp.status_code, 401)
+
+    def test_bulk_soft_delete_bugs(self):
+        user = FactoryData.create_user(False)
+        user2 = FactoryData.create_user('user2', False)
+        bugs = [FactoryData.create_bug(user) for _ in range(3)]
+        already_deleted = FactoryData.create_bug(user, 'DELETED')
+        other_users_bug = FactoryData.create_bug(user2)
+        ids = [bugs[0].id, bugs[1].id, already_deleted.id, other_users_bug.id, 9999]
+
+        request = RequestFactory().patch(API_BUGS_BULK_STATUS, data={'ids': ids, 'status': 'DELETED'},
+                                         content_type='application/json')
+        force_authenticate(request, user=user)
+        with self.assertNumQueries(5):
+            resp = BugViewSet.as_view({'patch': 'bulk_status'})(request)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'updated': [bugs[0].id, bugs[1].id], 'unchanged': [already_deleted.id],
+                                     'not_found': [other_users_bug.id, 9999]})
+        self.assertEqual(list(Bug.objects.exclude(status=Status.DELETED).values_list('id', flat=True).order_by('id')),
+                         [bugs[2].id, other_users_bug.id])
+        self.assertEqual(UserStats.objects.get(user=user).active_bugs, 1)
+
+    def test_bulk_status_revives_deleted_bugs(self):
+        user = FactoryData.create_user(False)
+        deleted = FactoryData.create_bug(user, 'DELETED')
+        live = FactoryData.create_bug(user)
+
+        request = RequestFactory().patch(API_BUGS_BULK_STATUS, data={'ids': [deleted.id, live.id], 'status': 'UPDATED'},
+                                         content_type='application/json')
+        force_authenticate(request, user=user)
+        resp = BugViewSet.as_view({'patch': 'bulk_status'})(request)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(set(Bug.objects.values_list('status', flat=True)), {'UPDATED'})
+        self.assertEqual(UserStats.objects.get(user=user).active_bugs, 2)
+
+    def test_bulk_status_with_invalid_status(self):
+        user = FactoryData.create_user(False)
+        bug = FactoryData.create_bug(user)
+
+        request = RequestFactory().patch(API_BUGS_BULK_STATUS, data={'ids': [bug.id], 'status': 'CLOSED'},
+                                         content_type='application/json')
+        force_authenticate(request, user=user)
+        resp = BugViewSet.as_view({'patch': 'bulk_status'})(request)
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(Bug.objects.get().status, 'NEW')
+
+    def test_delete_bug_twice_and_revive(self):
+        user = FactoryData.create_user(False)
+        bug = FactoryData.create_bug(user)
+        request = RequestFactory().delete(API_BUGS)
+        force_authenticate(request, user=user)
+        BugViewSet.as_view({'delete': 'destroy'})(request, pk=bug.id)
+
+        with self.assertNumQueries(2):
+            resp = BugViewSet.as_view({'delete': 'destroy'})(request, pk=bug.id)
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(BugViewSet.as_view({'delete': 'destroy'})(request, pk=9999).status_code, 404)
+        self.assertEqual(UserStats.objects.get(user=user).active_bugs, 0)
+
+        request = RequestFactory().patch(API_BUGS, data={'title': 'Back'}, content_type='application/json')
+        force_authenticate(request, user=user)
+        resp = BugViewSet.as_view({'patch': 'partial_update'})(request, pk=bug.id)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['title'], 'Back')
+        self.assertEqual(Bug.objects.get(pk=bug.id).status, 'UPDATED')
+        self.assertEqual(UserStats.objects.get(user=user).active_bugs, 1)
+
+    def test_retrieve_bug_not_modified(self):
+        user = FactoryData.create_user(False)
+        bug = FactoryData.create_bug(user)
+        request = RequestFactory().get(API_BUGS)
+        force_authenticate(request, user=user)
+        resp = BugViewSet.as_view({'get': 'retrieve'})(request, pk=bug.id)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('no-cache', resp['Cache-Control'])
+
+        request = RequestFactory().get(API_BUGS, HTTP_IF_NONE_MATCH=resp['ETag'])
+        force_authenticate(request, user=user)
+        with self.assertNumQueries(1):
+            not_modified = BugViewSet.as_view({'get': 'retrieve'})(request, pk=bug.id)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], resp['ETag'])
+
+        request = RequestFactory().get(API_BUGS, HTTP_IF_MODIFIED_SINCE=resp['Last-Modified'])
+        force_authenticate(request, user=user)
+        self.assertEqual(BugViewSet.as_view({'get': 'retrieve'})(request, pk=bug.id).status_code, 304)
+
+    def test_list_bugs_not_modified_until_a_write(self):
+        user = FactoryData.create_user(False)
+        bug = FactoryData.create_bug(user)
+        FactoryData.create_bug(user)
+        request = RequestFactory().get(API_BUGS)
+        force_authenticate(request, user=user)
+        etag = BugViewSet.as_view({'get': 'list'})(request)['ETag']
+
+        request = RequestFactory().get(API_BUGS, HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user=user)
+        with self.assertNumQueries(1):
+            resp = BugViewSet.as_view({'get': 'list'})(request)
+        self.assertEqual(resp.status_code, 304)
+
+        page_request = RequestFactory().get(API_BUGS, {'page_size': 1}, HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(page_request, user=user)
+        self.assertEqual(BugViewSet.as_view({'get': 'list'})(page_request).status_code, 200)
+
+        Bug.objects.filter(pk=bug.pk).update(status=Status.DELETED, updated_at=timezone.now())
+        resp = BugViewSet.as_view({'get': 'list'})(request)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['count'], 1)
+        self.assertNotEqual(resp['ETag'], etag)
+
+    def test_list_bugs_modified_by_archiving(self):
+        user = FactoryData.create_user(False)
+        FactoryData.create_bug(user)
+        request = RequestFactory().get(API_BUGS)
+        force_authenticate(request, user=user)
+        etag = BugViewSet.as_view({'get': 'list'})(request)['ETag']
+        bug = FactoryData.create_bug(user)
+        Bug.objects.filter(pk=bug.pk).update(status=Status.DELETED, updated_at=timezone.now() - timedelta(days=40))
+        call_command('archive_deleted', stdout=StringIO())
+
+        request = RequestFactory().get(API_BUGS, HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user=user)
+        resp = BugViewSet.as_view({'get': 'list'})(request)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp['ETag'], etag)
+
+    def test_partial_update_bug_loses_race_with_if_match(self):
+        user = FactoryData.create_user(False)
+        bug = FactoryData.create_bug(user)
+        stale = Bug.objects.get(pk=bug.pk)
+        Bug.objects.filter(pk=bug.pk).update(title='Concurrent', version=2)
+
+        request = RequestFactory().patch(API_BUGS, data={'title': 'Mine'}, HTTP_IF_MATCH='"1"',
+                                         content_type='application/json')
+        force_authenticate(request, user=user)
+        with mock.patch.object(BugViewSet, 'get_owned_row', return_value=mock.Mock(**{'first.return_value': stale})):
+            resp = BugViewSet.as_view({'patch': 'partial_update'})(request, pk=bug.id)
+
+        self.assertEqual(resp.status_code, 412)
+        self.assertEqual(Bug.objects.get(pk=bug.pk).title, 'Concurrent')
+
+    def test_partial_update_bug_archived_mid_request(self):
+        user = FactoryData.create_user(False)
+        bug = FactoryData.create_bug(user)
+        Bug.objects.filter(pk=bug.pk).delete()
+        owned = mock.Mock(**{'first.return_value': bug, 'exists.return_value': False})
+
+        request = RequestFactory().patch(API_BUGS, data={'title': 'Mine'}, content_type='application/json')
+        force_authenticate(request, user=user)
+        with mock.patch.object(BugViewSet, 'get_owned_row', return_value=owned):
+            resp = BugViewSet.as_view({'patch': 'partial_update'})(request, pk=bug.id)
+
+        self.assertEqual(resp.status_code, 404)
+
+    def test_partial_update_bug_with_unknown_if_match(self):
+        user = FactoryData.create_user(False)
+        bug = FactoryData.create_bug(user)
 
+        for if_match, expected in (('W/"1"', 412), ('"abc"', 412), ('"7", "1"', 200), ('*', 200)):
+            request = RequestFactory().patch(API_BUGS, data={'title': 'Mine'}, HTTP_IF_MATCH=if_match,
+                                             content_type='application/json')
+            force_authenticate(request, user=user)
+            Bug.objects.filter(pk=bug.pk).update(version=1)
+            resp = BugViewSet.as_view({'patch': 'partial_update'})(request, pk=bug.id)
+            self.assertEqual(resp.status_code, expected, if_match)
@@ -0,0 +1,117 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory, override_settings
+from rest_framework.test import force_authenticate
+
+from api.models.bug_model import Bug
+from api.tests.data_factory import FactoryData
+from api.views.bug_view import BugViewSet
+from api.views.cached_list_view import owner_version_key, response_cache_stats
+from api.views.sub_task_view import SubTaskViewSet
+from api.views.task_view import TaskViewSet
+
+API_BUGS = 'api/v1/bugs'
+API_TASKS = 'api/v1/tasks'
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                   CACHE_SINGLE_PROCESS=True)
+class CachedListViewTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = FactoryData.create_user()
+        FactoryData.create_bug(self.user)
+
+    def request(self, method, url, user, data=None, **headers):
+        if method == 'get':
+            request = RequestFactory().get(url, data or {}, **headers)
+        else:
+            request = getattr(RequestFactory(), method)(url, data=data or {}, content_type='application/json')
+        force_authenticate(request, user=user)
+        return request
+
+    def list_bugs(self, user=None, params=None, **headers):
+        return BugViewSet.as_view({'get': 'list'})(self.request('get', API_BUGS, user or self.user, params, **headers))
+
+    def test_repeated_list_is_served_from_cache(self):
+        first = self.list_bugs()
+        with self.assertNumQueries(0):
+            second = self.list_bugs()
+        with self.assertNumQueries(0):
+            not_modified = self.list_bugs(HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(response_cache_stats(), (2, 1, 2 / 3))
+
+    def test_query_params_are_part_of_the_key(self):
+        self.list_bugs()
+        FactoryData.create_bug(self.user)
+
+        self.assertNotIn('count', self.list_bugs(params={'pagination': 'cursor'}).data)
+        self.assertEqual(len(self.list_bugs().data['results']), 1)
+
+    def test_writes_bump_the_owner_version(self):
+        self.list_bugs()
+        BugViewSet.as_view({'post': 'create'})(
+            self.request('post', API_BUGS, self.user, {'title': 'Bug', 'description': 'd', 'priority': 'LOW'}))
+        bugs = self.list_bugs().data['results']
+        self.assertEqual(len(bugs), 2)
+
+        BugViewSet.as_view({'patch': 'partial_update'})(
+            self.request('patch', API_BUGS, self.user, {'title': 'Renamed'}), pk=bugs[0]['id'])
+        self.assertEqual(self.list_bugs().data['results'][0]['title'], 'Renamed')
+
+        BugViewSet.as_view({'delete': 'destroy'})(self.request('delete', API_BUGS, self.user), pk=bugs[0]['id'])
+        self.assertEqual(len(self.list_bugs().data['results']), 1)
+
+    def test_evicted_version_is_not_reused(self):
+        self.list_bugs()
+        cache.delete(owner_version_key(self.user.pk))
+        Bug.objects.filter(author=self.user).update(title='Renamed')
+
+        self.assertEqual(self.list_bugs().data['results'][0]['title'], 'Renamed')
+
+    @override_settings(CACHE_SINGLE_PROCESS=False)
+    def test_process_local_cache_is_refused(self):
+        self.list_bugs()
+
+        with self.assertNumQueries(3):
+            self.list_bugs()
+        self.assertEqual(response_cache_stats(), (0, 0, 0.0))
+
+    def test_sub_task_writes_refresh_task_lists(self):
+        task = FactoryData.create_task(self.user)
+        list_tasks = TaskViewSet.as_view({'get': 'list'})
+        self.assertEqual(list_tasks(self.request('get', API_TASKS, self.user)).data['results'][0]['total_subtasks'], 0)
+
+        SubTaskViewSet.as_view({'post': 'create'})(
+            self.request('post', API_TASKS, self.user, {'description': 'sub task', 'due_date': '2019-09-22T00:00:00Z'}),
+            task_pk=task.id)
+
+        self.assertEqual(list_tasks(self.request('get', API_TASKS, self.user)).data['results'][0]['total_subtasks'], 1)
+
+    def test_entries_are_per_owner(self):
+        other = FactoryData.create_user('other')
+        self.list_bugs()
+        FactoryData.create_bug(other)
+        BugViewSet.as_view({'post': 'create'})(
+            self.request('post', API_BUGS, other, {'title': 'Bug', 'description': 'd', 'priority': 'LOW'}))
+
+        self.assertEqual(len(self.list_bugs(other).data['results']), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(self.list_bugs().data['results']), 1)
+
+    def test_stats_command(self):
+        self.list_bugs()
+        self.list_bugs()
+        out = StringIO()
+
+        call_command('response_cache_stats', reset=True, stdout=out)
+
+        self.assertEqual(out.getvalue().splitlines(), ['hits: 1', 'misses: 1', 'hit ratio: 50.0%'])
+        self.assertEqual(response_cache_stats(), (0, 0, 0.0))
@@ -173,4 +173,17 @@ class GroupViewTest(TestCase):
 
         self.assertEqual(resp.status_code, 405)
 
+    def test_group_actions_query_count(self):
+        user = FactoryData.create_user('user2', True)
+        FactoryData.create_group()
+        token = FactoryData.create_token(user)
 
+        request = RequestFactory().get(API_GROUPS, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(2):
+            GroupViewSet.as_view({'get': 'list'})(request)
+
+        request = RequestFactory().post(API_GROUPS, data={'name': 'group'}, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(2):
+            GroupViewSet.as_view({'post': 'create'})(request)
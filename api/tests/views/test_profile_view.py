@@ -1,8 +1,11 @@
-from django.contrib.auth.models import AnonymousUser
-from django.test import TestCase, RequestFactory
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser, update_last_login
+from django.test import TestCase, RequestFactory, override_settings
 from rest_framework.test import force_authenticate
 from rest_framework.utils import json
 
+from api.models.login_info_model import login_info_queue
 from api.tests.data_factory import FactoryData
 from api.views.profile_view import ProfileViewSet
 
@@ -66,3 +69,49 @@ class ProfileViewTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(profile_response['results'][0]['total_bugs'], 3)
         self.assertEqual(profile_response['results'][0]['active_bugs'], 2)
+
+    def test_get_profile_query_count(self):
+        user = FactoryData.create_user('user', True)
+        token = FactoryData.create_token(user)
+        request = RequestFactory().get(API_PROFILE, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+
+        with self.assertNumQueries(2):
+            ProfileViewSet.as_view({'get': 'list'})(request, user_pk=user.id)
+
+    @override_settings(LOGIN_INFO_RECORDING='write_behind', LOGIN_INFO_FLUSH_SECONDS=3600)
+    def test_get_profile_total_logins_after_flush(self):
+        user = FactoryData.create_user('user', True)
+        token = FactoryData.create_token(user)
+        with mock.patch.object(login_info_queue, '_start_flusher'), self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                update_last_login(None, user)
+        login_info_queue.flush()
+
+        request = RequestFactory().get(API_PROFILE, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        resp = ProfileViewSet.as_view({'get': 'list'})(request, user_pk=user.id)
+
+        self.assertEqual(resp.data['results'][0]['total_logins'], 3)
+
+    def test_get_profile_counters(self):
+        user = FactoryData.create_user('user', True)
+        token = FactoryData.create_token(user)
+        FactoryData.create_bug(user, 'NEW')
+        FactoryData.create_bug(user, 'DELETED')
+        task = FactoryData.create_task(user)
+        FactoryData.create_task(user, 'DELETED')
+        FactoryData.create_sub_task(task)
+        FactoryData.create_sub_task(task, 'DELETED')
+        update_last_login(None, user)
+        request = RequestFactory().get(API_PROFILE, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+
+        resp = ProfileViewSet.as_view({'get': 'list'})(request, user_pk=user.id)
+        profile = resp.data['results'][0]
+
+        self.assertEqual(profile['total_bugs'], 2)
+        self.assertEqual(profile['active_bugs'], 1)
+        self.assertEqual(profile['total_tasks'], 2)
+        self.assertEqual(profile['total_subtasks'], 2)
+        self.assertEqual(profile['total_logins'], 1)
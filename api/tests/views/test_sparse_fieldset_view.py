@@ -0,0 +1,84 @@
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import force_authenticate
+
+from api.tests.data_factory import FactoryData
+from api.views.bug_view import BugViewSet
+from api.views.sub_task_view import SubTaskViewSet
+from api.views.task_view import TaskViewSet
+from api.views.user_view import UserViewSet
+
+API_BUGS = 'api/v1/bugs'
+API_TASKS = 'api/v1/tasks'
+API_USERS = 'api/v1/users'
+
+
+class SparseFieldsetViewTest(TestCase):
+
+    def setUp(self):
+        self.user = FactoryData.create_user()
+        self.bugs = [FactoryData.create_bug(self.user) for _ in range(3)]
+
+    def get(self, viewset, action, url, params, user=None, **kwargs):
+        request = RequestFactory().get(url, params)
+        force_authenticate(request, user=user or self.user)
+        with CaptureQueriesContext(connection) as queries:
+            resp = viewset.as_view({'get': action})(request, **kwargs)
+        return resp, queries
+
+    def test_list_bugs_with_fields(self):
+        resp, queries = self.get(BugViewSet, 'list', API_BUGS, {'fields': 'id,title'})
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([set(bug) for bug in resp.data['results']], [{'id', 'title'}] * 3)
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn('description', queries[-1]['sql'])
+        self.assertNotIn('priority', queries[-1]['sql'])
+
+    def test_cursor_pages_with_fields(self):
+        for _ in range(9):
+            FactoryData.create_bug(self.user)
+        first, _ = self.get(BugViewSet, 'list', API_BUGS, {'fields': 'title', 'pagination': 'cursor'})
+        request = RequestFactory().get(first.data['next'])
+        force_authenticate(request, user=self.user)
+
+        with self.assertNumQueries(2):
+            second = BugViewSet.as_view({'get': 'list'})(request)
+
+        self.assertEqual(second.data['results'], [{'title': 'Bug'}] * 2)
+
+    def test_retrieve_task_skips_total_subtasks(self):
+        task = FactoryData.create_task(self.user)
+
+        resp, queries = self.get(TaskViewSet, 'retrieve', API_TASKS, {'fields': 'id,body'}, pk=task.id)
+
+        self.assertEqual(resp.data, {'id': task.id, 'body': task.body})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('sub_tasks_count', queries[0]['sql'])
+        self.assertEqual(resp['ETag'], '"1"')
+
+    def test_list_sub_tasks_with_fields(self):
+        task = FactoryData.create_task(self.user)
+        FactoryData.create_sub_task(task)
+
+        resp, queries = self.get(SubTaskViewSet, 'list', API_TASKS, {'fields': 'due_date'}, task_pk=task.id)
+
+        self.assertEqual(list(resp.data['results'][0]), ['due_date'])
+        self.assertNotIn('"description"', queries[-1]['sql'])
+
+    def test_list_users_with_fields(self):
+        root = FactoryData.create_user('root', root=True)
+
+        resp, queries = self.get(UserViewSet, 'list', API_USERS, {'fields': 'username'}, user=root)
+
+        self.assertEqual([user['username'] for user in resp.data['results']], ['root', 'username'])
+        self.assertNotIn('"email"', queries[-1]['sql'])
+
+    def test_unknown_and_write_only_fields(self):
+        resp, _ = self.get(BugViewSet, 'list', API_BUGS, {'fields': 'id,author'})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data, {'fields': ['Unknown field: author']})
+
+        resp, _ = self.get(UserViewSet, 'retrieve', API_USERS, {'fields': 'password'}, pk=self.user.id)
+        self.assertEqual(resp.status_code, 400)
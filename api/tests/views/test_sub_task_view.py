@@ -5,11 +5,14 @@ from rest_framework.test import force_authenticate
 from rest_framework.utils import json
 
 from api.models.sub_task_model import SubTask
+from api.models.user_stats_model import UserStats
 from api.tests.data_factory import FactoryData
 from api.views.sub_task_view import SubTaskViewSet
 
 API_TASKS = 'api/v1/tasks/'
 API_SUB_TASK = '/subtasks'
+API_SUB_TASK_BULK = '/subtasks/bulk'
+API_SUB_TASK_BULK_STATUS = '/subtasks/bulk/status'
 
 
 class SubTaskViewTest(TestCase):
@@ -114,7 +117,7 @@ class SubTaskViewTest(TestCase):
     def test_get_sub_task_with_token_deactivated_status(self):
         user = FactoryData.create_user()
         task = FactoryData.create_task(user)
-        FactoryData.create_sub_task(task, 'DEACTIVATE')
+        FactoryData.create_sub_task(task, 'DELETED')
 
         token = FactoryData.create_token(user)
         token.generate_key()
@@ -285,4 +288,154 @@ class SubTaskViewTest(TestCase):
 
         self.assertEqual(resp.status_code, 403)
 
+    def test_sub_task_actions_query_count(self):
+        user = FactoryData.create_user()
+        task = FactoryData.create_task(user)
+        sub_task = FactoryData.create_sub_task(task)
+        token = FactoryData.create_token(user)
+        data = {
+            'description': 'Sub task body message',
+            'due_date': '2019-09-22T00:00:00Z'
+        }
+        url = API_TASKS + str(task.pk) + API_SUB_TASK
+
+        request = RequestFactory().get(url, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(4):
+            SubTaskViewSet.as_view({'get': 'list'})(request, task_pk=task.id)
+        with self.assertNumQueries(2):
+            SubTaskViewSet.as_view({'get': 'retrieve'})(request, task_pk=task.id, pk=sub_task.id)
+
+        request = RequestFactory().post(url, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(6):
+            SubTaskViewSet.as_view({'post': 'create'})(request, task_pk=task.id)
+
+        request = RequestFactory().patch(url, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(2):
+            SubTaskViewSet.as_view({'patch': 'partial_update'})(request, task_pk=task.id, pk=sub_task.id)
+
+        request = RequestFactory().delete(url, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(2):
+            SubTaskViewSet.as_view({'delete': 'destroy'})(request, task_pk=task.id, pk=sub_task.id)
 
+    def test_sub_tasks_count_follows_create_delete_and_revive(self):
+        user = FactoryData.create_user()
+        task = FactoryData.create_task(user)
+        token = FactoryData.create_token(user)
+        data = {
+            'description': 'Sub task body message',
+            'due_date': '2019-09-22T00:00:00Z'
+        }
+        url = API_TASKS + str(task.pk) + API_SUB_TASK
+
+        request = RequestFactory().post(url, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        sub_task_id = SubTaskViewSet.as_view({'post': 'create'})(request, task_pk=task.id).data['id']
+        task.refresh_from_db()
+        self.assertEqual(task.sub_tasks_count, 1)
+
+        request = RequestFactory().delete(url, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        SubTaskViewSet.as_view({'delete': 'destroy'})(request, task_pk=task.id, pk=sub_task_id)
+        SubTaskViewSet.as_view({'delete': 'destroy'})(request, task_pk=task.id, pk=sub_task_id)
+        task.refresh_from_db()
+        self.assertEqual(task.sub_tasks_count, 0)
+
+        request = RequestFactory().patch(url, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        SubTaskViewSet.as_view({'patch': 'partial_update'})(request, task_pk=task.id, pk=sub_task_id)
+        task.refresh_from_db()
+        self.assertEqual(task.sub_tasks_count, 1)
+
+    def test_bulk_create_sub_tasks(self):
+        user = FactoryData.create_user()
+        task = FactoryData.create_task(user)
+        token = FactoryData.create_token(user)
+        data = [{'description': 'Step %d' % i, 'due_date': '2019-09-22T00:00:00Z'} for i in range(50)]
+
+        request = RequestFactory().post(API_TASKS + str(task.pk) + API_SUB_TASK_BULK, data=data,
+                                        HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(6):
+            resp = SubTaskViewSet.as_view({'post': 'bulk'})(request, task_pk=task.id)
+
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual([sub_task['description'] for sub_task in resp.data], ['Step %d' % i for i in range(50)])
+        self.assertEqual(list(SubTask.objects.filter(task=task).order_by('pk').values_list('pk', flat=True)),
+                         [sub_task['id'] for sub_task in resp.data])
+        task.refresh_from_db()
+        self.assertEqual(task.sub_tasks_count, 50)
+        self.assertEqual(UserStats.objects.get(user=user).total_subtasks, 50)
+
+    def test_bulk_create_sub_tasks_is_all_or_nothing(self):
+        user = FactoryData.create_user()
+        task = FactoryData.create_task(user)
+        token = FactoryData.create_token(user)
+        data = [{'description': 'Step', 'due_date': '2019-09-22T00:00:00Z'}, {'description': ''}]
+
+        request = RequestFactory().post(API_TASKS + str(task.pk) + API_SUB_TASK_BULK, data=data,
+                                        HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        resp = SubTaskViewSet.as_view({'post': 'bulk'})(request, task_pk=task.id)
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(set(resp.data['errors'][1]), {'description', 'due_date'})
+        self.assertFalse(SubTask.objects.exists())
+
+    def test_bulk_create_sub_tasks_for_another_users_task(self):
+        user = FactoryData.create_user()
+        user2 = FactoryData.create_user('user2')
+        task = FactoryData.create_task(user)
+        data = [{'description': 'Step', 'due_date': '2019-09-22T00:00:00Z'}]
+
+        request = RequestFactory().post(API_TASKS + str(task.pk) + API_SUB_TASK_BULK, data=data,
+                                        content_type='application/json')
+        force_authenticate(request, user=user2)
+        resp = SubTaskViewSet.as_view({'post': 'bulk'})(request, task_pk=task.id)
+
+        self.assertEqual(resp.status_code, 404)
+        self.assertFalse(SubTask.objects.exists())
+
+    def test_bulk_soft_delete_sub_tasks(self):
+        user = FactoryData.create_user()
+        task = FactoryData.create_task(user)
+        other_task = FactoryData.create_task(user)
+        sub_tasks = [FactoryData.create_sub_task(task) for _ in range(3)]
+        other_sub_task = FactoryData.create_sub_task(other_task)
+
+        request = RequestFactory().patch(API_TASKS + str(task.pk) + API_SUB_TASK_BULK_STATUS,
+                                         data={'ids': [sub_tasks[0].id, sub_tasks[1].id, other_sub_task.id],
+                                               'status': 'DELETED'},
+                                         content_type='application/json')
+        force_authenticate(request, user=user)
+        resp = SubTaskViewSet.as_view({'patch': 'bulk_status'})(request, task_pk=task.id)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'updated': [sub_tasks[0].id, sub_tasks[1].id], 'unchanged': [],
+                                     'not_found': [other_sub_task.id]})
+        task.refresh_from_db()
+        other_task.refresh_from_db()
+        self.assertEqual(task.sub_tasks_count, 1)
+        self.assertEqual(other_task.sub_tasks_count, 1)
+
+    def test_list_sub_tasks_not_modified(self):
+        user = FactoryData.create_user()
+        task = FactoryData.create_task(user)
+        FactoryData.create_sub_task(task)
+        request = RequestFactory().get(API_TASKS + str(task.pk) + API_SUB_TASK)
+        force_authenticate(request, user=user)
+        etag = SubTaskViewSet.as_view({'get': 'list'})(request, task_pk=task.id)['ETag']
+
+        request = RequestFactory().get(API_TASKS + str(task.pk) + API_SUB_TASK, HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user=user)
+        with self.assertNumQueries(2):
+            resp = SubTaskViewSet.as_view({'get': 'list'})(request, task_pk=task.id)
+        self.assertEqual(resp.status_code, 304)
+
+        other_task = FactoryData.create_task(user)
+        FactoryData.create_sub_task(other_task)
+        self.assertEqual(SubTaskViewSet.as_view({'get': 'list'})(request, task_pk=task.id).status_code, 304)
+        self.assertEqual(SubTaskViewSet.as_view({'get': 'list'})(request, task_pk=other_task.id).status_code, 200)
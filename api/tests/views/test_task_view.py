@@ -1,14 +1,18 @@
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
 from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.core import serializers
 from rest_framework.test import force_authenticate
 from rest_framework.utils import json
 
 from api.models.task_model import Task
 from api.tests.data_factory import FactoryData
+from api.views.sub_task_view import SubTaskViewSet
 from api.views.task_view import TaskViewSet
 
 API_TASKS = 'api/v1/tasks'
+API_TASKS_BULK_STATUS = 'api/v1/tasks/bulk/status'
 
 
 class TaskViewTest(TestCase):
@@ -83,7 +87,7 @@ class TaskViewTest(TestCase):
 
     def test_get_task_with_token_deactivated_status(self):
         user = FactoryData.create_user(False)
-        FactoryData.create_task(user, 'DEACTIVATE')
+        FactoryData.create_task(user, 'DELETED')
         token = FactoryData.create_token(user)
         token.generate_key()
         request = RequestFactory().get(API_TASKS, HTTP_AUTHORIZATION=token.key)
@@ -256,3 +260,121 @@ class TaskViewTest(TestCase):
 
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(response['total_subtasks'], 1)
+
+    def test_task_actions_query_count(self):
+        user = FactoryData.create_user(False)
+        task = FactoryData.create_task(user)
+        token = FactoryData.create_token(user)
+        data = {
+            'body': 'Task body message'
+        }
+
+        request = RequestFactory().get(API_TASKS, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(3):
+            TaskViewSet.as_view({'get': 'list'})(request)
+        with self.assertNumQueries(1):
+            TaskViewSet.as_view({'get': 'retrieve'})(request, pk=task.id)
+
+        request = RequestFactory().post(API_TASKS, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(4):
+            TaskViewSet.as_view({'post': 'create'})(request)
+
+        request = RequestFactory().patch(API_TASKS, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(2):
+            TaskViewSet.as_view({'patch': 'partial_update'})(request, pk=task.id)
+
+        request = RequestFactory().delete(API_TASKS, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(1):
+            TaskViewSet.as_view({'delete': 'destroy'})(request, pk=task.id)
+
+    def test_list_tasks_query_count_is_constant_in_page_size(self):
+        user = FactoryData.create_user(False)
+        token = FactoryData.create_token(user)
+        for _ in range(5):
+            FactoryData.create_sub_task(FactoryData.create_task(user))
+        request = RequestFactory().get(API_TASKS, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+
+        with self.assertNumQueries(3):
+            resp = TaskViewSet.as_view({'get': 'list'})(request)
+
+        self.assertEqual(len(resp.data['results']), 5)
+        self.assertEqual([task['total_subtasks'] for task in resp.data['results']], [1] * 5)
+
+    def test_bulk_update_task_status(self):
+        user = FactoryData.create_user()
+        tasks = [FactoryData.create_task(user) for _ in range(3)]
+        other_users_task = FactoryData.create_task(FactoryData.create_user('user2'))
+
+        request = RequestFactory().patch(API_TASKS_BULK_STATUS,
+                                         data={'ids': [tasks[0].id, tasks[2].id, other_users_task.id], 'status': 'UPDATED'},
+                                         content_type='application/json')
+        force_authenticate(request, user=user)
+        resp = TaskViewSet.as_view({'patch': 'bulk_status'})(request)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'updated': [tasks[0].id, tasks[2].id], 'unchanged': [],
+                                     'not_found': [other_users_task.id]})
+        self.assertEqual(list(Task.objects.filter(status='UPDATED').values_list('id', flat=True).order_by('id')),
+                         [tasks[0].id, tasks[2].id])
+
+    def test_partial_update_task_only_writes_changed_columns(self):
+        user = FactoryData.create_user()
+        task = FactoryData.create_task(user)
+        FactoryData.create_sub_task(task)
+        request = RequestFactory().patch(API_TASKS, data={'body': 'New body'}, content_type='application/json')
+        force_authenticate(request, user=user)
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = TaskViewSet.as_view({'patch': 'partial_update'})(request, pk=task.id)
+
+        task.refresh_from_db()
+        self.assertEqual(resp.data['status'], 'UPDATED')
+        self.assertEqual(task.body, 'New body')
+        self.assertEqual(task.sub_tasks_count, 1)
+        self.assertNotIn('sub_tasks_count', queries[-1]['sql'])
+
+    def test_retrieve_task_changes_etag_with_its_sub_tasks(self):
+        user = FactoryData.create_user(False)
+        task = FactoryData.create_task(user)
+        request = RequestFactory().get(API_TASKS)
+        force_authenticate(request, user=user)
+        etag = TaskViewSet.as_view({'get': 'retrieve'})(request, pk=task.id)['ETag']
+
+        request = RequestFactory().post(API_TASKS + '/' + str(task.pk) + '/subtasks', content_type='application/json',
+                                        data={'description': 'sub task', 'due_date': '2019-09-22T00:00:00Z'})
+        force_authenticate(request, user=user)
+        SubTaskViewSet.as_view({'post': 'create'})(request, task_pk=task.id)
+
+        request = RequestFactory().get(API_TASKS, HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user=user)
+        resp = TaskViewSet.as_view({'get': 'retrieve'})(request, pk=task.id)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['total_subtasks'], 1)
+
+    def test_partial_update_task_with_if_match(self):
+        user = FactoryData.create_user(False)
+        task = FactoryData.create_task(user)
+        request = RequestFactory().get(API_TASKS)
+        force_authenticate(request, user=user)
+        etag = TaskViewSet.as_view({'get': 'retrieve'})(request, pk=task.id)['ETag']
+
+        request = RequestFactory().patch(API_TASKS, data={'body': 'First'}, HTTP_IF_MATCH=etag,
+                                         content_type='application/json')
+        force_authenticate(request, user=user)
+        with self.assertNumQueries(2):
+            resp = TaskViewSet.as_view({'patch': 'partial_update'})(request, pk=task.id)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['ETag'], '"2"')
+
+        request = RequestFactory().patch(API_TASKS, data={'body': 'Second'}, HTTP_IF_MATCH=etag,
+                                         content_type='application/json')
+        force_authenticate(request, user=user)
+        resp = TaskViewSet.as_view({'patch': 'partial_update'})(request, pk=task.id)
+        self.assertEqual(resp.status_code, 412)
+        task.refresh_from_db()
+        self.assertEqual((task.body, task.version), ('First', 2))
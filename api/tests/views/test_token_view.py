@@ -1,7 +1,18 @@
-from django.test import TestCase, RequestFactory
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.db.models import QuerySet, signals
+from django.test import TestCase, TransactionTestCase, RequestFactory, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
 from rest_framework.authtoken.models import Token
 from rest_framework.utils import json
 
+from api.authentication.token_expire_handler import get_or_rotate_token
+from api.models.login_info_model import LoginInfo
 from api.tests.data_factory import FactoryData
 from api.views.token_view import TokenViewSet
 
@@ -46,4 +57,127 @@ class TokenViewTest(TestCase):
 
         self.assertEqual(resp.status_code, 404)
 
+    def test_login_rotates_expired_token(self):
+        FactoryData.create_user_and_save('login_test')
+        data = {
+            'username': 'login_test',
+            'password': 'password',
+        }
+        expired_token = Token.objects.create(user_id=1)
+        Token.objects.filter(key=expired_token.key).update(created=expired_token.created - timedelta(days=1))
+
+        request = RequestFactory().post(API_LOGIN, data=data, content_type='application/json')
+        resp = TokenViewSet.login(request)
+        token = Token.objects.get(user=1)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(token.key, expired_token.key)
+        self.assertEqual(json.loads(json.dumps(resp.data))['token'], token.key)
+
+    def test_login_query_count(self):
+        FactoryData.create_user_and_save('login_test')
+        data = {
+            'username': 'login_test',
+            'password': 'password',
+        }
+
+        request = RequestFactory().post(API_LOGIN, data=data, content_type='application/json')
+        with self.assertNumQueries(11):
+            TokenViewSet.login(request)
+
+        self.assertEqual(LoginInfo.objects.filter(user=1).count(), 1)
+
+    def test_login_write_count(self):
+        FactoryData.create_user_and_save('login_test')
+        data = {
+            'username': 'login_test',
+            'password': 'password',
+        }
+
+        request = RequestFactory().post(API_LOGIN, data=data, content_type='application/json')
+        with CaptureQueriesContext(connection) as queries:
+            TokenViewSet.login(request)
+        writes = [query['sql'] for query in queries.captured_queries if query['sql'].startswith(('INSERT', 'UPDATE'))]
+
+        self.assertEqual(len(writes), 4)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class TokenViewConcurrencyTest(TransactionTestCase):
+
+    def test_parallel_rotations_share_one_token(self):
+        user = FactoryData.create_user('login_test')
+        expired_token = Token.objects.create(user=user)
+        Token.objects.filter(key=expired_token.key).update(created=expired_token.created - timedelta(days=1))
+
+        def rotate(_):
+            try:
+                return get_or_rotate_token(user).key
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            keys = set(executor.map(rotate, range(16)))
+
+        self.assertEqual(len(keys), 1)
+        self.assertNotIn(expired_token.key, keys)
+        self.assertEqual(Token.objects.count(), 1)
+
+    def test_parallel_rotations_take_the_row_lock_once_each(self):
+        user = FactoryData.create_user('login_test')
+        expired_token = Token.objects.create(user=user)
+        Token.objects.filter(key=expired_token.key).update(created=expired_token.created - timedelta(days=1))
+        select_for_update = QuerySet.select_for_update
+        acquisitions, created = [], []
+
+        def counting_select_for_update(queryset, *args, **kwargs):
+            if queryset.model is User:
+                acquisitions.append(threading.get_ident())
+            return select_for_update(queryset, *args, **kwargs)
+
+        def count_created(sender, instance, **kwargs):
+            if kwargs['created']:
+                created.append(instance.key)
+
+        def rotate(_):
+            try:
+                return get_or_rotate_token(user).key
+            finally:
+                connections.close_all()
+
+        signals.post_save.connect(count_created, sender=Token)
+        try:
+            with mock.patch.object(QuerySet, 'select_for_update', counting_select_for_update), \
+                    ThreadPoolExecutor(max_workers=8) as executor:
+                keys = set(executor.map(rotate, range(16)))
+        finally:
+            signals.post_save.disconnect(count_created, sender=Token)
+
+        self.assertEqual(len(acquisitions), 16)
+        self.assertEqual(created, list(keys))
+        self.assertEqual(Token.objects.count(), 1)
+
+    # Exercises the row lock across real connections; SQLite has no SELECT ... FOR UPDATE, so this needs the
+    # PostgreSQL run. The striped in-process lock is covered above on every backend.
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_parallel_logins_share_one_token(self):
+        FactoryData.create_user_and_save('login_test')
+        data = {
+            'username': 'login_test',
+            'password': 'password',
+        }
+
+        def login(_):
+            try:
+                request = RequestFactory().post(API_LOGIN, data=data, content_type='application/json')
+                resp = TokenViewSet.login(request)
+                return resp.status_code, resp.data.get('token')
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(login, range(16)))
 
+        self.assertEqual(set(status_code for status_code, _ in results), {200})
+        self.assertEqual(len(set(key for _, key in results)), 1)
+        self.assertEqual(Token.objects.count(), 1)
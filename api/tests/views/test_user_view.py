@@ -1,12 +1,20 @@
+from unittest import mock
+
 from django.contrib.auth.models import AnonymousUser, User, Group
-from django.test import TestCase, RequestFactory
+from django.db import connection
+from django.test import TestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import force_authenticate
 from rest_framework.utils import json
 
+from api.models.profile_model import Profile
+from api.models.user_stats_model import UserStats
+from api.provisioning.user_import import hash_passwords
 from api.tests.data_factory import FactoryData
 from api.views.user_view import UserViewSet
 
 API_USERS = 'api/v1/users'
+API_USERS_BULK = 'api/v1/users/bulk'
 
 
 class UserViewTest(TestCase):
@@ -220,6 +228,101 @@ class UserViewTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(user_response['count'], 1)
 
+    def test_user_actions_query_count(self):
+        user = FactoryData.create_user()
+        token = FactoryData.create_token(user)
+        data = {
+                'name': 'User_updated',
+        }
+
+        request = RequestFactory().get(API_USERS, HTTP_AUTHORIZATION=token.key)
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(2):
+            UserViewSet.as_view({'get': 'list'})(request)
+        with self.assertNumQueries(1):
+            UserViewSet.as_view({'get': 'retrieve'})(request, pk=user.id)
+
+        request = RequestFactory().patch(API_USERS, data=data, HTTP_AUTHORIZATION=token.key, content_type='application/json')
+        force_authenticate(request, user=user, token=token)
+        with self.assertNumQueries(2):
+            UserViewSet.as_view({'patch': 'partial_update'})(request, pk=user.id)
+
+    def test_post_user_write_count(self):
+        data = {
+                'username': 'User',
+                'email': 'email@email.com',
+                'password': 'cpriority',
+                'name': 'Roberto'
+        }
+
+        request = RequestFactory().post(API_USERS, data=data, content_type='application/json')
+        request.user = AnonymousUser()
+        with CaptureQueriesContext(connection) as queries:
+            resp = UserViewSet.as_view({'post': 'create'})(request)
+        writes = [query['sql'] for query in queries.captured_queries if query['sql'].startswith(('INSERT', 'UPDATE'))]
+
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(len(writes), 5)
+        self.assertEqual(Profile.objects.filter(user_id=resp.data['id']).count(), 1)
 
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_bulk_import_users(self):
+        root = FactoryData.create_user('root', True)
+        data = [{'username': 'candidate%d' % i, 'email': 'c%d@email.com' % i, 'name': 'Candidate', 'password': 'secret%d' % i}
+                for i in range(4)]
 
+        request = RequestFactory().post(API_USERS_BULK, data=data, content_type='application/json')
+        force_authenticate(request, user=root)
+        resp = UserViewSet.as_view({'post': 'bulk'})(request)
 
+        self.assertEqual(resp.status_code, 201)
+        users = list(User.objects.filter(pk__in=resp.data['ids']).order_by('pk'))
+        self.assertEqual([user.username for user in users], ['candidate%d' % i for i in range(4)])
+        self.assertTrue(users[3].check_password('secret3'))
+        self.assertEqual(Group.objects.get(name='candidates').user_set.count(), 4)
+        self.assertEqual(Profile.objects.filter(user__in=users).count(), 4)
+        self.assertEqual(UserStats.objects.filter(user__in=users).count(), 4)
+        self.assertGreater(resp.data['users_per_second'], 0)
+
+    def test_bulk_import_users_rejects_taken_usernames(self):
+        root = FactoryData.create_user('root', True)
+        data = [{'username': 'fresh', 'email': 'fresh@email.com', 'name': 'Fresh', 'password': 'secret'},
+                {'username': 'root', 'email': 'root@email.com', 'name': 'Root', 'password': 'secret'}]
+
+        request = RequestFactory().post(API_USERS_BULK, data=data, content_type='application/json')
+        force_authenticate(request, user=root)
+        resp = UserViewSet.as_view({'post': 'bulk'})(request)
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(list(resp.data['errors']), [1])
+        self.assertFalse(User.objects.filter(username='fresh').exists())
+
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_bulk_import_users_loses_username_race(self):
+        root = FactoryData.create_user('root', True)
+        data = [{'username': 'fresh', 'email': 'fresh@email.com', 'name': 'Fresh', 'password': 'secret'},
+                {'username': 'late', 'email': 'late@email.com', 'name': 'Late', 'password': 'secret'}]
+
+        def hash_while_late_signs_up(passwords, processes=None):
+            User.objects.create(username='late')
+            return hash_passwords(passwords, 1)
+
+        request = RequestFactory().post(API_USERS_BULK, data=data, content_type='application/json')
+        force_authenticate(request, user=root)
+        with mock.patch('api.provisioning.user_import.hash_passwords', side_effect=hash_while_late_signs_up):
+            resp = UserViewSet.as_view({'post': 'bulk'})(request)
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(list(resp.data['errors']), [1])
+        self.assertFalse(User.objects.filter(username='fresh').exists())
+
+    def test_bulk_import_users_without_super(self):
+        user = FactoryData.create_user()
+        data = [{'username': 'fresh', 'email': 'fresh@email.com', 'name': 'Fresh', 'password': 'secret'}]
+
+        request = RequestFactory().post(API_USERS_BULK, data=data, content_type='application/json')
+        force_authenticate(request, user=user)
+        resp = UserViewSet.as_view({'post': 'bulk'})(request)
+
+        self.assertEqual(resp.status_code, 401)
+        self.assertFalse(User.objects.filter(username='fresh').exists())
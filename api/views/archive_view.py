@@ -0,0 +1,45 @@
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+
+class ArchiveMixin:
+    """
+    Adds read-only `archive` routes to an OwnerScopedViewSet for rows that archive_deleted moved out of the hot table.
+    Archived rows are looked up in `archive_model` with the same owner scope as the live ones.
+    """
+    archive_model = None
+    archive_serializer_class = None
+
+    def get_archive_queryset(self):
+        return self.archive_model.objects.filter(**self.get_archive_scope()).order_by('-archived_at', '-id')
+
+    def get_archive_scope(self):
+        return self.get_scope()
+
+    def get_count_scope(self):
+        if getattr(self, 'action', None) in ('archive', 'archived'):
+            return None
+        return super(ArchiveMixin, self).get_count_scope()
+
+    @swagger_auto_schema(
+        operation_description='This endpoint to list archived items',
+    )
+    @action(detail=False, methods=['get'], url_path='archive')
+    def archive(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_archive_queryset())
+        serializer = self.archive_serializer_class(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        responses={
+            status.HTTP_404_NOT_FOUND: "Not Found",
+        },
+        operation_description='This endpoint to retrieve an archived item',
+    )
+    @action(detail=False, methods=['get'], url_path=r'archive/(?P<archive_pk>[0-9]+)')
+    def archived(self, request, *args, **kwargs):
+        archived = get_object_or_404(self.get_archive_queryset(), pk=kwargs['archive_pk'])
+        return Response(self.archive_serializer_class(archived).data)
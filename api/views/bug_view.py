@@ -1,31 +1,47 @@
+from django.db import transaction
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import viewsets, status
-
-from rest_framework.authtoken.models import Token
+from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from api.models.archive_model import BugArchive
 from api.models.bug_model import Bug
 from api.models.choices.status_choices import Status
+from api.models.user_stats_model import UserStats
+from api.pagination.keyset_pagination import KeysetPagination
 from api.permissions.action_based_permission import ActionBasedPermission
+from api.serializers.archive_serializer import BugArchiveSerializer
 from api.serializers.bug_serializer import BugSerializer
-
-HTTP_AUTHORIZATION = 'HTTP_AUTHORIZATION'
+from api.views.archive_view import ArchiveMixin
+from api.views.bulk_view import BulkCreateMixin, BulkStatusMixin
+from api.views.cached_list_view import CachedListMixin
+from api.views.conditional_view import version_etag
+from api.views.owner_scoped_view import OwnerScopedViewSet
+from api.views.sparse_fieldset_view import SparseFieldsetMixin
 
 
-class BugViewSet(viewsets.ModelViewSet):
+class BugViewSet(CachedListMixin, SparseFieldsetMixin, BulkStatusMixin, BulkCreateMixin, ArchiveMixin,
+                 OwnerScopedViewSet):
     permission_classes = (ActionBasedPermission,)
     action_permissions = {
-        IsAuthenticated: ['update', 'partial_update', 'destroy', 'list', 'retrieve', 'create'],
+        IsAuthenticated: ['update', 'partial_update', 'destroy', 'list', 'retrieve', 'create',
+                          'archive', 'archived', 'bulk', 'bulk_status'],
     }
     queryset = Bug.objects.order_by('-created_at',)
     serializer_class = BugSerializer
+    pagination_class = KeysetPagination
+    archive_model = BugArchive
+    archive_serializer_class = BugArchiveSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']
 
-    def get_queryset(self):
-        auth_token = self.request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-        return Bug.objects.filter(author=user, status__in=[Status.NEW, Status.UPDATED]).order_by('-created_at',)
+    def build_bulk_objects(self, validated_data):
+        return [Bug(author=self.owner, status=Status.NEW, **item) for item in validated_data]
+
+    def after_bulk_create(self, bugs):
+        UserStats.increment(self.owner, total_bugs=len(bugs), active_bugs=len(bugs))
+
+    def after_status_change(self, revived, deleted):
+        UserStats.increment(self.owner, active_bugs=revived - deleted)
 
     @swagger_auto_schema(
         responses={
@@ -37,11 +53,11 @@ class BugViewSet(viewsets.ModelViewSet):
         request_body=BugSerializer,
     )
     def create(self, request, *args, **kwargs):
-        auth_token = request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
         bug_serializer = BugSerializer(data=request.data)
         bug_serializer.is_valid(raise_exception=True)
-        bug_serializer.save(author=user, status=Status.NEW)
+        with transaction.atomic():
+            bug_serializer.save(author=self.owner, status=Status.NEW)
+        self.invalidate_caches()
         return Response(bug_serializer.data, status=status.HTTP_201_CREATED)
 
     @swagger_auto_schema(
@@ -53,11 +69,7 @@ class BugViewSet(viewsets.ModelViewSet):
         operation_description='This endpoint to destroy a bug',
     )
     def destroy(self, request, *args, **kwargs):
-        auth_token = request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-        bug = Bug.objects.filter(author=user, pk=kwargs['pk'])
-        if bug:
-            bug.update(status=Status.DELETED)
+        if self.soft_delete_owned_row(kwargs['pk']):
             return Response(status=status.HTTP_202_ACCEPTED)
         else:
             return Response(status=status.HTTP_404_NOT_FOUND)
@@ -66,22 +78,16 @@ class BugViewSet(viewsets.ModelViewSet):
         responses={
             status.HTTP_200_OK: BugSerializer,
             status.HTTP_404_NOT_FOUND: "Not Found",
+            status.HTTP_412_PRECONDITION_FAILED: "Precondition Failed",
         },
         operation_id='Update a Bug',
         operation_description='This endpoint to update bug',
     )
     def partial_update(self, request, *args, **kwargs):
-        auth_token = request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-        bug_set = Bug.objects.filter(author=user, pk=kwargs['pk'])
-        if bug_set.first():
-            bug_set.update(status=Status.UPDATED)
-            bug_serializer = BugSerializer(bug_set.first(),
-                                           data=request.data,
-                                           partial=True)
-            if bug_serializer.is_valid():
-                bug_serializer.save()
-            return Response(bug_serializer.data, status=status.HTTP_200_OK)
+        bug_serializer = self.update_owned_row(kwargs['pk'], BugSerializer, request.data)
+        if bug_serializer:
+            return Response(bug_serializer.data, status=status.HTTP_200_OK,
+                            headers={'ETag': version_etag(bug_serializer.instance.version)})
         else:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from api.models.choices.status_choices import Status
+from api.serializers.bulk_status_serializer import BulkStatusSerializer
+
+
+class BulkCreateMixin:
+    """
+    Adds POST <list route>/bulk to an OwnerScopedViewSet. The body is a JSON array validated with the view's serializer;
+    either every item is valid and all rows are inserted with one bulk_create in one transaction, or nothing is inserted
+    and the response maps the index of every invalid item to its errors.
+
+    Views using it must define build_bulk_objects(validated_data), which turns the validated items into unsaved model
+    instances, and may define after_bulk_create(objects) to update counters in the same transaction.
+    """
+
+    def get_bulk_max_size(self):
+        return getattr(settings, 'BULK_MAX_BATCH_SIZE', 500)
+
+    def after_bulk_create(self, objects):
+        pass
+
+    @swagger_auto_schema(
+        responses={
+            status.HTTP_201_CREATED: "Created",
+            status.HTTP_400_BAD_REQUEST: "Bad Request",
+        },
+        operation_description='This endpoint to create a list of items at once',
+    )
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        max_size = self.get_bulk_max_size()
+        if isinstance(request.data, list) and len(request.data) > max_size:
+            return Response({'error': 'A bulk request accepts at most %d items' % max_size},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer_class()(data=request.data, many=True, allow_empty=False)
+        if not serializer.is_valid():
+            return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        objects = self.build_bulk_objects(serializer.validated_data)
+        with transaction.atomic():
+            objects = self.queryset.model.objects.bulk_create(objects)
+            self.after_bulk_create(objects)
+        self.invalidate_caches()
+        return Response(self.get_serializer_class()(objects, many=True).data, status=status.HTTP_201_CREATED)
+
+
+class BulkStatusMixin:
+    """
+    Adds PATCH <list route>/bulk/status to an OwnerScopedViewSet. It moves the caller's rows with the given ids to one
+    status (DELETED being a bulk soft-delete) with UPDATE ... WHERE id IN (...) and reports which ids were updated,
+    which already had the status and which were not found in the caller's scope. Rows are not locked: the counters
+    follow the row counts of the UPDATEs, and the report is read just before them.
+    """
+
+    @swagger_auto_schema(
+        request_body=BulkStatusSerializer,
+        responses={
+            status.HTTP_200_OK: "OK",
+            status.HTTP_400_BAD_REQUEST: "Bad Request",
+        },
+        operation_description='This endpoint to change the status of a list of items at once',
+    )
+    @action(detail=False, methods=['patch'], url_path='bulk/status')
+    def bulk_status(self, request, *args, **kwargs):
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids, target = list(dict.fromkeys(serializer.validated_data['ids'])), serializer.validated_data['status']
+
+        rows = self.get_owned_queryset().filter(pk__in=ids)
+        found = dict(rows.values_list('pk', 'status'))
+        stamp = dict(status=target, updated_at=timezone.now(), version=F('version') + 1)
+        with transaction.atomic():
+            pending = rows.exclude(status=target)
+            if target == Status.DELETED:
+                revived, deleted, changed = 0, pending.update(**stamp), 0
+            else:
+                revived, deleted = pending.filter(status=Status.DELETED).update(**stamp), 0
+                changed = pending.update(**stamp)
+            self.after_status_change(revived, deleted)
+        if revived or deleted or changed:
+            self.invalidate_caches()
+        return Response({'updated': [pk for pk in ids if pk in found and found[pk] != target],
+                         'unchanged': [pk for pk in ids if found.get(pk) == target],
+                         'not_found': [pk for pk in ids if pk not in found]}, status=status.HTTP_200_OK)
@@ -0,0 +1,81 @@
+"""
+Per-owner cache of list responses. Entries are keyed by (owner, endpoint, query string, owner data version); writes
+never delete entries, they bump the owner's version with one atomic cache.incr, so every entry written before it is
+simply never read again and ages out with LIST_RESPONSE_CACHE_SECONDS. Versions come from get_cache_version(), so one
+evicted from the cache is never handed out again. Hits and misses are counted in the same cache.
+
+Every worker has to see the same versions, so like the counts, responses are only cached when cache_is_shared().
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from api.pagination.cached_count_pagination import bump_cache_version, cache_is_shared, get_cache_version
+from api.views.conditional_view import ConditionalGetMixin
+
+HITS_KEY = 'list-response:hits'
+MISSES_KEY = 'list-response:misses'
+
+
+def owner_version_key(owner_pk):
+    return 'list-response-version:%s' % owner_pk
+
+
+def invalidate_owner_responses(owner_pk):
+    bump_cache_version(owner_version_key(owner_pk))
+
+
+def count_lookup(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def response_cache_stats():
+    hits, misses = cache.get(HITS_KEY, 0), cache.get(MISSES_KEY, 0)
+    return hits, misses, hits / (hits + misses) if hits + misses else 0.0
+
+
+def reset_response_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+class CachedListMixin(ConditionalGetMixin):
+    """
+    Serves list from the owner's response cache. A cached entry keeps the ETag and Last-Modified it was served with,
+    so a hit answers If-None-Match without touching the database at all. Views bump the version through
+    invalidate_caches(); nothing else needs to know the cache exists.
+    """
+    cache_list_responses = True
+
+    def get_list_cache_key(self):
+        version = get_cache_version(owner_version_key(self.owner.pk))
+        endpoint = [self.queryset.model._meta.label_lower] + sorted(self.kwargs.items())
+        params = sorted(self.request.query_params.lists())
+        digest = hashlib.md5(json.dumps([endpoint, params]).encode('utf-8')).hexdigest()
+        return 'list-response:%s:%s:%s' % (self.owner.pk, version, digest)
+
+    def list(self, request, *args, **kwargs):
+        if not self.cache_list_responses or not cache_is_shared():
+            return super(CachedListMixin, self).list(request, *args, **kwargs)
+
+        key = self.get_list_cache_key()
+        cached = cache.get(key)
+        count_lookup(HITS_KEY if cached is not None else MISSES_KEY)
+        if cached is not None:
+            data, etag, last_modified = cached
+            not_modified = self.get_not_modified(etag, last_modified)
+            return self.set_validators(not_modified or Response(data), etag, last_modified)
+
+        response = super(CachedListMixin, self).list(request, *args, **kwargs)
+        if response.status_code == 200:
+            last_modified = parse_http_date_safe(response.get('Last-Modified'))
+            cache.set(key, (response.data, response['ETag'], last_modified),
+                      getattr(settings, 'LIST_RESPONSE_CACHE_SECONDS', 300))
+        return response
@@ -0,0 +1,82 @@
+import hashlib
+
+from django.db.models import Max, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_etags
+from rest_framework.response import Response
+
+
+def version_etag(version):
+    return '"%d"' % version
+
+
+def parse_version_etags(header):
+    """
+    Row versions named by an If-Match header, or None when there is no precondition (no header, or `*`). Weak or
+    foreign tags never match, so a header made only of those yields an empty list.
+    """
+    if not header:
+        return None
+    etags = parse_etags(header)
+    if etags == ['*']:
+        return None
+    return [int(etag[1:-1]) for etag in etags if etag[1:-1].isdigit()]
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETags and Last-Modified for retrieve and list, so polling clients get a 304 without the view serializing
+    anything. retrieve validates on the row version, the same ETag PATCH accepts in If-Match; list on MAX(updated_at)
+    over the caller's rows, deleted ones included so that a delete moves it, and the query string. Every write that
+    changes a listed row stamps updated_at, so no row count is needed and the page count stays with the pagination
+    class's cached or estimated count. Archiving takes rows out of that MAX, so views with an `archive_model` also take
+    the latest archived_at of the caller's archived rows, and the validator only ever moves forward.
+    """
+
+    validator_fields = ('updated_at', 'version')
+
+    @staticmethod
+    def make_etag(*parts):
+        return '"%s"' % hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def to_timestamp(updated_at):
+        return int(updated_at.timestamp()) if updated_at else None
+
+    def get_not_modified(self, etag, last_modified):
+        return get_conditional_response(self.request._request, etag=etag, last_modified=last_modified)
+
+    @staticmethod
+    def set_validators(response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = version_etag(instance.version)
+        last_modified = self.to_timestamp(instance.updated_at)
+        not_modified = self.get_not_modified(etag, last_modified)
+        if not_modified is not None:
+            return self.set_validators(not_modified, etag, last_modified)
+        return self.set_validators(Response(self.get_serializer(instance).data), etag, last_modified)
+
+    def get_list_updated_at(self):
+        updated_at = Max('updated_at')
+        if getattr(self, 'archive_model', None) is not None:
+            archived_at = Subquery(self.get_archive_queryset().order_by('-archived_at').values('archived_at')[:1])
+            updated_at = Greatest(Coalesce(updated_at, archived_at), Coalesce(archived_at, updated_at))
+        return self.get_owned_queryset().aggregate(updated_at=updated_at)['updated_at']
+
+    def list(self, request, *args, **kwargs):
+        updated_at = self.get_list_updated_at()
+        etag = self.make_etag(self.get_count_scope(), updated_at and updated_at.isoformat(),
+                              sorted(request.query_params.lists()))
+        last_modified = self.to_timestamp(updated_at)
+        not_modified = self.get_not_modified(etag, last_modified)
+        if not_modified is not None:
+            return self.set_validators(not_modified, etag, last_modified)
+        return self.set_validators(super(ConditionalGetMixin, self).list(request, *args, **kwargs), etag, last_modified)
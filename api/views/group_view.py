@@ -1,14 +1,14 @@
-from django.contrib.auth.models import Group, User
-from rest_framework import viewsets, status
-from rest_framework.authtoken.models import Token
+from django.contrib.auth.models import Group
+from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from api.permissions.action_based_permission import ActionBasedPermission
 from api.serializers.group_serializer import GroupSerializer
+from api.views.owner_scoped_view import OwnerScopedViewSet
 
 
-class GroupViewSet(viewsets.ModelViewSet):
+class GroupViewSet(OwnerScopedViewSet):
     swagger_schema = None
     permission_classes = (ActionBasedPermission,)
     action_permissions = {
@@ -19,20 +19,13 @@ class GroupViewSet(viewsets.ModelViewSet):
     http_method_names = ['get', 'post']
 
     def get_queryset(self):
-        auth_token = self.request.META.get('HTTP_AUTHORIZATION', '').replace('Token ', '')
-        username = Token.objects.get(key=auth_token).user
-        user = User.objects.get(username=username)
-
-        if user.is_superuser:
+        if self.owner.is_superuser:
             return Group.objects.all()
         else:
             return Group.objects.filter(name='invalid')
 
     def create(self, request, *args, **kwargs):
-        auth_token = request.META.get('HTTP_AUTHORIZATION', '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-
-        if user.is_superuser:
+        if self.owner.is_superuser:
             group_serializer = GroupSerializer(data=request.data)
             group_serializer.is_valid(raise_exception=True)
             group = group_serializer.save()
@@ -0,0 +1,110 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import exceptions, status, viewsets
+
+from api.models.choices.status_choices import Status, ACTIVE_STATUSES
+from api.pagination.cached_count_pagination import invalidate_count_scope
+from api.views.cached_list_view import invalidate_owner_responses
+from api.views.conditional_view import parse_version_etags
+
+
+class PreconditionFailed(exceptions.APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The resource has changed since it was read.'
+    default_code = 'precondition_failed'
+
+
+class OwnerScopedViewSet(viewsets.ModelViewSet):
+    """
+    Base ViewSet for resources owned by the authenticated user. The owner is taken once from what the authenticator
+    resolved (the token's user), so views never go back to the Token table to find out who is calling.
+    """
+    owner_field = 'author'
+    ordering = ('-created_at',)
+
+    @property
+    def owner(self):
+        if not hasattr(self, '_owner'):
+            self._owner = getattr(self.request.auth, 'user', None) or self.request.user
+        return self._owner
+
+    def get_scope(self):
+        return {self.owner_field: self.owner}
+
+    def get_count_scope(self):
+        scope = ','.join('%s=%s' % (field, value.pk) for field, value in sorted(self.get_scope().items()))
+        return '%s:%s' % (self.queryset.model._meta.label_lower, scope)
+
+    def invalidate_caches(self):
+        """
+        Called after every write: drops the cached list counts for the scope and every cached list response of the
+        owner.
+        """
+        invalidate_count_scope(self.get_count_scope())
+        invalidate_owner_responses(self.owner.pk)
+
+    def get_owned_queryset(self):
+        return self.queryset.model.objects.filter(**self.get_scope())
+
+    def get_owned_row(self, pk):
+        return self.get_owned_queryset().filter(pk=pk)
+
+    def get_queryset(self):
+        return self.get_owned_queryset().filter(status__in=ACTIVE_STATUSES).order_by(*self.ordering)
+
+    def after_status_change(self, revived, deleted):
+        """
+        Hook for counters derived from the status: called in the writing transaction with the number of rows that left
+        DELETED and the number that became DELETED.
+        """
+
+    def update_owned_row(self, pk, serializer_class, data):
+        """
+        PATCH in one SELECT and one UPDATE: the row is loaded once and only the changed columns, status UPDATED,
+        updated_at and the bumped version are written, so counters kept with F() are never overwritten. With If-Match
+        the UPDATE is a compare-and-swap on the version read, and PreconditionFailed (412) is raised when another
+        writer got there first; no row lock is held. As before, an invalid payload still marks the row UPDATED.
+        Returns None when the caller has no such row, including one archived between the SELECT and the UPDATE.
+        """
+        expected = parse_version_etags(self.request.META.get('HTTP_IF_MATCH'))
+        row = self.get_owned_row(pk).first()
+        if row is None:
+            return None
+        if expected is not None and row.version not in expected:
+            raise PreconditionFailed()
+        revived = int(row.status == Status.DELETED)
+        with transaction.atomic(savepoint=False):
+            serializer = serializer_class(row, data=data, partial=True)
+            changes = dict(serializer.validated_data) if serializer.is_valid() else {}
+            changes.update(status=Status.UPDATED, updated_at=timezone.now())
+            rows = type(row).objects.filter(pk=row.pk)
+            if expected is not None:
+                rows = rows.filter(version=row.version)
+            updated = rows.update(version=F('version') + 1, **changes)
+            if updated and revived:
+                self.after_status_change(revived, 0)
+        if not updated:
+            if expected is not None and self.get_owned_row(pk).exists():
+                raise PreconditionFailed()
+            return None
+        for field, value in changes.items():
+            setattr(row, field, value)
+        row.version += 1
+        self.invalidate_caches()
+        return serializer
+
+    def soft_delete_owned_row(self, pk):
+        """
+        DELETE as one conditional UPDATE; the rowcount says whether the row changed. Only when nothing changed is the
+        row looked up, to tell a row that was already DELETED (True) from one the caller does not have (False).
+        """
+        with transaction.atomic(savepoint=False):
+            deleted = self.get_owned_row(pk).exclude(status=Status.DELETED) \
+                .update(status=Status.DELETED, updated_at=timezone.now(), version=F('version') + 1)
+            if deleted:
+                self.after_status_change(0, deleted)
+        if deleted:
+            self.invalidate_caches()
+            return True
+        return self.get_owned_row(pk).exists()
@@ -1,18 +1,13 @@
-from rest_framework.authtoken.models import Token
-
 from django.contrib.auth.models import User
-from rest_framework import filters, viewsets
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.response import Response
 
 from api.permissions.action_based_permission import ActionBasedPermission
 from api.serializers.profile_serializer import ProfileSerializer
-
-HTTP_AUTHORIZATION = 'HTTP_AUTHORIZATION'
+from api.views.owner_scoped_view import OwnerScopedViewSet
 
 
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(OwnerScopedViewSet):
     swagger_schema = None
     permission_classes = (ActionBasedPermission,)
     action_permissions = {
@@ -24,10 +19,7 @@ class ProfileViewSet(viewsets.ModelViewSet):
     http_method_names = ['get']
 
     def get_queryset(self):
-        auth_token = self.request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        username = Token.objects.get(key=auth_token).user
-        user = User.objects.get(username=username)
-        if user.is_superuser:
-            return User.objects.filter(id=self.kwargs.get('user_pk'))
+        if self.owner.is_superuser:
+            return User.objects.filter(id=self.kwargs.get('user_pk')).select_related('userstats')
         else:
             raise PermissionDenied
@@ -0,0 +1,65 @@
+"""
+Sparse fieldsets: `?fields=id,title` on list and retrieve renders only the named fields and loads only the columns
+behind them with .only(). The primary key, the ordering columns and the view's validator_fields (what the conditional
+GET reads) are always loaded, so nothing the view itself touches is ever a deferred column.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+FIELDS_QUERY_PARAM = 'fields'
+SPARSE_ACTIONS = ('list', 'retrieve')
+
+
+class SparseFieldsetMixin:
+
+    def get_sparse_fields(self):
+        """
+        The field names requested with ?fields=, or None when the whole representation is wanted. Unknown or
+        write-only names are a 400.
+        """
+        if not hasattr(self, '_sparse_fields'):
+            action = getattr(self, 'action', None)
+            raw = self.request.query_params.get(FIELDS_QUERY_PARAM) if action in SPARSE_ACTIONS else None
+            requested = [name.strip() for name in raw.split(',') if name.strip()] if raw else []
+            if not requested:
+                self._sparse_fields = None
+            else:
+                readable = {name for name, field in self.get_serializer_class()().fields.items()
+                            if not field.write_only}
+                unknown = [name for name in requested if name not in readable]
+                if unknown:
+                    raise ValidationError({FIELDS_QUERY_PARAM: ['Unknown field: %s' % name for name in unknown]})
+                self._sparse_fields = set(requested)
+        return self._sparse_fields
+
+    def get_sparse_columns(self, queryset, fields):
+        model = queryset.model
+        serializer_fields = self.get_serializer_class()().fields
+        columns = {model._meta.pk.name}
+        columns.update(order.lstrip('-') for order in queryset.query.order_by)
+        columns.update(getattr(self, 'validator_fields', ()))
+        for name in fields:
+            source = serializer_fields[name].source.split('.')[0]
+            try:
+                if model._meta.get_field(source).concrete:
+                    columns.add(source)
+            except FieldDoesNotExist:
+                pass
+        return sorted(columns)
+
+    def filter_queryset(self, queryset):
+        queryset = super(SparseFieldsetMixin, self).filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        return queryset.only(*self.get_sparse_columns(queryset, fields))
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super(SparseFieldsetMixin, self).get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            child = getattr(serializer, 'child', serializer)
+            for name in set(child.fields) - fields:
+                child.fields.pop(name)
+        return serializer
@@ -1,33 +1,73 @@
+from django.db import transaction
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import viewsets, status
-from rest_framework.authtoken.models import Token
+from rest_framework import status
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from api.models.choices.status_choices import Status
+from api.models.archive_model import SubTaskArchive
+from api.models.choices.status_choices import Status, ACTIVE_STATUSES
 from api.models.sub_task_model import SubTask
 from api.models.task_model import Task
+from api.models.user_stats_model import UserStats
+from api.pagination.keyset_pagination import KeysetPagination
 from api.permissions.action_based_permission import ActionBasedPermission
+from api.serializers.archive_serializer import SubTaskArchiveSerializer
 from api.serializers.sub_task_serializer import SubTaskSerializer
+from api.views.archive_view import ArchiveMixin
+from api.views.bulk_view import BulkCreateMixin, BulkStatusMixin
+from api.views.cached_list_view import CachedListMixin
+from api.views.conditional_view import version_etag
+from api.views.owner_scoped_view import OwnerScopedViewSet
+from api.views.sparse_fieldset_view import SparseFieldsetMixin
 
-HTTP_AUTHORIZATION = 'HTTP_AUTHORIZATION'
 
-
-class SubTaskViewSet(viewsets.ModelViewSet):
+class SubTaskViewSet(CachedListMixin, SparseFieldsetMixin, BulkStatusMixin, BulkCreateMixin, ArchiveMixin,
+                     OwnerScopedViewSet):
     permission_classes = (ActionBasedPermission,)
     action_permissions = {
-        IsAuthenticated: ['update', 'partial_update', 'destroy', 'list', 'retrieve', 'create'],
+        IsAuthenticated: ['update', 'partial_update', 'destroy', 'list', 'retrieve', 'create',
+                          'archive', 'archived', 'bulk', 'bulk_status'],
     }
     queryset = SubTask.objects.order_by('-created_at',)
     serializer_class = SubTaskSerializer
+    pagination_class = KeysetPagination
+    archive_model = SubTaskArchive
+    archive_serializer_class = SubTaskArchiveSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']
 
-    def get_queryset(self):
-        auth_token = self.request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-        task = get_object_or_404(Task, author=user,  pk=self.kwargs['task_pk'], status__in=['NEW', 'UPDATED'])
-        return SubTask.objects.filter(task=task, status__in=[Status.NEW, Status.UPDATED]).order_by('-created_at',)
+    def get_task(self):
+        if not hasattr(self, '_task'):
+            self._task = get_object_or_404(Task, author=self.owner, pk=self.kwargs['task_pk'], status__in=ACTIVE_STATUSES)
+        return self._task
+
+    def get_scope(self):
+        return {'task': self.get_task()}
+
+    def get_owned_row(self, pk):
+        return SubTask.objects.filter(pk=pk, task_id=self.kwargs['task_pk'], task__author=self.owner,
+                                      task__status__in=ACTIVE_STATUSES)
+
+    def get_count_scope(self):
+        if self.action in ('archive', 'archived'):
+            return super(SubTaskViewSet, self).get_count_scope()
+        return 'api.subtask:task=%s' % self.kwargs['task_pk']
+
+    def get_archive_scope(self):
+        return {'task_id': self.kwargs['task_pk'], 'author': self.owner}
+
+    def adjust_sub_tasks_count(self, delta):
+        Task.adjust_sub_tasks_count(self.kwargs['task_pk'], delta)
+
+    def build_bulk_objects(self, validated_data):
+        return [SubTask(task=self.get_task(), status=Status.NEW, **item) for item in validated_data]
+
+    def after_bulk_create(self, sub_tasks):
+        self.adjust_sub_tasks_count(len(sub_tasks))
+        UserStats.increment(self.owner, total_subtasks=len(sub_tasks))
+
+    def after_status_change(self, revived, deleted):
+        self.adjust_sub_tasks_count(revived - deleted)
 
     @swagger_auto_schema(
         responses={
@@ -39,12 +79,11 @@ class SubTaskViewSet(viewsets.ModelViewSet):
         request_body=SubTaskSerializer,
     )
     def create(self, request, *args, **kwargs):
-        auth_token = request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-        task = get_object_or_404(Task, author=user, pk=self.kwargs['task_pk'], status__in=['NEW', 'UPDATED'])
         sub_task_serializer = SubTaskSerializer(data=request.data)
         sub_task_serializer.is_valid(raise_exception=True)
-        sub_task_serializer.save(task=task, status='NEW')
+        with transaction.atomic():
+            sub_task_serializer.save(task=self.get_task(), status='NEW')
+        self.invalidate_caches()
         return Response(sub_task_serializer.data, status=status.HTTP_201_CREATED)
 
     @swagger_auto_schema(
@@ -56,12 +95,7 @@ class SubTaskViewSet(viewsets.ModelViewSet):
         operation_description='This endpoint to destroy a SubTask',
     )
     def destroy(self, request, *args, **kwargs):
-        auth_token = request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-        task = get_object_or_404(Task, author=user, pk=self.kwargs['task_pk'], status__in=['NEW', 'UPDATED'])
-        sub_task = SubTask.objects.filter(task=task, pk=kwargs['pk'])
-        if sub_task:
-            sub_task.update(status=Status.DELETED)
+        if self.soft_delete_owned_row(kwargs['pk']):
             return Response(status=status.HTTP_202_ACCEPTED)
         else:
             return Response(status=status.HTTP_404_NOT_FOUND)
@@ -70,23 +104,16 @@ class SubTaskViewSet(viewsets.ModelViewSet):
         responses={
             status.HTTP_200_OK: SubTaskSerializer,
             status.HTTP_404_NOT_FOUND: "Not Found",
+            status.HTTP_412_PRECONDITION_FAILED: "Precondition Failed",
         },
         operation_id='Update a SubTask',
         operation_description='This endpoint to update SubTask',
     )
     def partial_update(self, request, *args, **kwargs):
-        auth_token = request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-        task = get_object_or_404(Task, author=user, pk=self.kwargs['task_pk'], status__in=['NEW', 'UPDATED'])
-        sub_task_set = SubTask.objects.filter(task=task, pk=kwargs['pk'])
-        if sub_task_set.first():
-            sub_task_set.update(status=Status.UPDATED)
-            sub_task_serializer = SubTaskSerializer(sub_task_set.first(),
-                                                    data=request.data,
-                                                    partial=True)
-            if sub_task_serializer.is_valid():
-                sub_task_serializer.save()
-            return Response(sub_task_serializer.data, status=status.HTTP_200_OK)
+        sub_task_serializer = self.update_owned_row(kwargs['pk'], SubTaskSerializer, request.data)
+        if sub_task_serializer:
+            return Response(sub_task_serializer.data, status=status.HTTP_200_OK,
+                            headers={'ETag': version_etag(sub_task_serializer.instance.version)})
         else:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
@@ -1,31 +1,37 @@
+from django.db import transaction
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import viewsets, status
-from rest_framework.authtoken.models import Token
+from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from api.models.archive_model import TaskArchive
 from api.models.choices.status_choices import Status
 from api.models.task_model import Task
+from api.pagination.keyset_pagination import KeysetPagination
 from api.permissions.action_based_permission import ActionBasedPermission
+from api.serializers.archive_serializer import TaskArchiveSerializer
 from api.serializers.task_serializer import TaskSerializer
+from api.views.archive_view import ArchiveMixin
+from api.views.bulk_view import BulkStatusMixin
+from api.views.cached_list_view import CachedListMixin
+from api.views.conditional_view import version_etag
+from api.views.owner_scoped_view import OwnerScopedViewSet
+from api.views.sparse_fieldset_view import SparseFieldsetMixin
 
-HTTP_AUTHORIZATION = 'HTTP_AUTHORIZATION'
 
-
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(CachedListMixin, SparseFieldsetMixin, BulkStatusMixin, ArchiveMixin, OwnerScopedViewSet):
     permission_classes = (ActionBasedPermission,)
     action_permissions = {
-        IsAuthenticated: ['update', 'partial_update', 'destroy', 'list', 'retrieve', 'create'],
+        IsAuthenticated: ['update', 'partial_update', 'destroy', 'list', 'retrieve', 'create',
+                          'archive', 'archived', 'bulk_status'],
     }
     queryset = Task.objects.order_by('-created_at',)
     serializer_class = TaskSerializer
+    pagination_class = KeysetPagination
+    archive_model = TaskArchive
+    archive_serializer_class = TaskArchiveSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']
 
-    def get_queryset(self):
-        auth_token = self.request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-        return Task.objects.filter(author=user, status__in=[Status.NEW, Status.UPDATED]).order_by('-created_at',)
-
     @swagger_auto_schema(
         responses={
             status.HTTP_201_CREATED: TaskSerializer,
@@ -36,11 +42,11 @@ class TaskViewSet(viewsets.ModelViewSet):
         request_body=TaskSerializer,
     )
     def create(self, request, *args, **kwargs):
-        auth_token = request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
         task_serializer = TaskSerializer(data=request.data)
         task_serializer.is_valid(raise_exception=True)
-        task_serializer.save(author=user, status='NEW')
+        with transaction.atomic():
+            task_serializer.save(author=self.owner, status=Status.NEW)
+        self.invalidate_caches()
         return Response(task_serializer.data, status=status.HTTP_201_CREATED)
 
     @swagger_auto_schema(
@@ -52,11 +58,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         operation_description='This endpoint to destroy a Task',
     )
     def destroy(self, request, *args, **kwargs):
-        auth_token = request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-        task = Task.objects.filter(author=user, pk=kwargs['pk'])
-        if task:
-            task.update(status=Status.DELETED)
+        if self.soft_delete_owned_row(kwargs['pk']):
             return Response(status=status.HTTP_202_ACCEPTED)
         else:
             return Response(status=status.HTTP_404_NOT_FOUND)
@@ -65,22 +67,16 @@ class TaskViewSet(viewsets.ModelViewSet):
         responses={
             status.HTTP_200_OK: TaskSerializer,
             status.HTTP_404_NOT_FOUND: "Not Found",
+            status.HTTP_412_PRECONDITION_FAILED: "Precondition Failed",
         },
         operation_id='Update a Task',
         operation_description='This endpoint to update Task',
     )
     def partial_update(self, request, *args, **kwargs):
-        auth_token = request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user = Token.objects.get(key=auth_token).user
-        task_set = Task.objects.filter(author=user, pk=kwargs['pk'])
-        if task_set.first():
-            task_set.update(status=Status.UPDATED)
-            task_serializer = TaskSerializer(task_set.first(),
-                                             data=request.data,
-                                             partial=True)
-            if task_serializer.is_valid():
-                task_serializer.save()
-            return Response(task_serializer.data, status=status.HTTP_200_OK)
+        task_serializer = self.update_owned_row(kwargs['pk'], TaskSerializer, request.data)
+        if task_serializer:
+            return Response(task_serializer.data, status=status.HTTP_200_OK,
+                            headers={'ETag': version_etag(task_serializer.instance.version)})
         else:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
@@ -6,7 +6,6 @@ from django.views.decorators.csrf import csrf_exempt
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
-from rest_framework.authtoken.models import Token
 from rest_framework import viewsets, status
 from rest_framework.status import (
     HTTP_400_BAD_REQUEST,
@@ -15,7 +14,9 @@ from rest_framework.status import (
 )
 from rest_framework.response import Response
 
-from api.authentication.token_expire_handler import token_expire_handler, expires_in
+from api.authentication.signed_token_authentication import is_signed_token_mode, issue_signed_token, \
+    signed_token_expires_in
+from api.authentication.token_expire_handler import get_or_rotate_token, expires_in
 from api.serializers.error_serializer import ErrorResponseSerializer
 from api.serializers.token_serializer import TokenSerializer, TokenResponseSerializer
 
@@ -49,12 +50,16 @@ class TokenViewSet(viewsets.ModelViewSet):
         if not user:
             return Response({'error': 'Invalid Credentials'}, status=HTTP_404_NOT_FOUND)
 
-        token, _ = Token.objects.get_or_create(user=user)
-        is_expired, token = token_expire_handler(token)
+        if is_signed_token_mode():
+            token = issue_signed_token(user)
+            seconds_to_expire = signed_token_expires_in(token)
+        else:
+            token = get_or_rotate_token(user)
+            seconds_to_expire = expires_in(token).seconds
 
         update_last_login(None, user)
 
         return Response({'token': token.key,
                          'userId': user.id,
-                         'seconds_to_expire': expires_in(token).seconds, }, status=HTTP_200_OK)
+                         'seconds_to_expire': seconds_to_expire, }, status=HTTP_200_OK)
 
@@ -1,37 +1,40 @@
+from django.conf import settings
 from django.contrib.auth.models import User, Group
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import viewsets, status, filters
-from rest_framework.authtoken.models import Token
+from rest_framework import status, filters
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from api.pagination.cached_count_pagination import CachedCountPagination, invalidate_count_scope
 from api.permissions.action_based_permission import ActionBasedPermission
+from api.provisioning.user_import import import_users, UserImportError, CANDIDATES_GROUP
 from api.serializers.user_serializer import UserSerializer
+from api.views.owner_scoped_view import OwnerScopedViewSet
+from api.views.sparse_fieldset_view import SparseFieldsetMixin
 
-HTTP_AUTHORIZATION = 'HTTP_AUTHORIZATION'
 
-
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsetMixin, OwnerScopedViewSet):
     permission_classes = (ActionBasedPermission,)
     action_permissions = {
-        IsAuthenticated: ['update', 'partial_update', 'destroy', 'list', 'retrieve', ],
+        IsAuthenticated: ['update', 'partial_update', 'destroy', 'list', 'retrieve', 'bulk'],
         AllowAny: ['create']
     }
     search_fields = ['username', 'email']
     filter_backends = (filters.SearchFilter,)
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_class = CachedCountPagination
     http_method_names = ['get', 'post', 'patch']
 
     def get_queryset(self):
-        auth_token = self.request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        username = Token.objects.get(key=auth_token).user
-        user = User.objects.get(username=username)
-
-        if user.is_superuser:
+        if self.owner.is_superuser:
             return User.objects.all().order_by('-date_joined')
         else:
-            return User.objects.filter(username=user.username).order_by('-date_joined')
+            return User.objects.filter(pk=self.owner.pk).order_by('-date_joined')
+
+    def get_count_scope(self):
+        return 'auth.user:all' if self.owner.is_superuser else None
 
     @swagger_auto_schema(
         responses={
@@ -47,18 +50,44 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer_context = {
             'request': request,
         }
-        group, created = Group.objects.get_or_create(name='candidates')
+        group, created = Group.objects.get_or_create(name=CANDIDATES_GROUP)
         user_serializer = UserSerializer(data=request.data)
         user_serializer.is_valid(raise_exception=True)
-        user = User.objects.create(username=request.data['username'],
-                                   email=request.data['email'],
-                                   first_name=request.data['name']
-                                   )
+        user = User(username=request.data['username'],
+                    email=request.data['email'],
+                    first_name=request.data['name']
+                    )
         user.set_password(request.data['password'])
-        group.user_set.add(user)
         user.save()
+        group.user_set.add(user)
+        invalidate_count_scope('auth.user:all')
         return Response(UserSerializer(user, context=serializer_context,).data, status=status.HTTP_201_CREATED)
 
+    @swagger_auto_schema(
+        responses={
+            status.HTTP_201_CREATED: "Created",
+            status.HTTP_400_BAD_REQUEST: "Bad Request",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        operation_id='Import users',
+        operation_description='This endpoint to create a list of candidate users at once, superusers only',
+    )
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        if not self.owner.is_superuser:
+            return Response(status=status.HTTP_401_UNAUTHORIZED)
+        max_size = getattr(settings, 'BULK_MAX_BATCH_SIZE', 500)
+        if isinstance(request.data, list) and len(request.data) > max_size:
+            return Response({'error': 'A bulk request accepts at most %d items' % max_size},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            result = import_users(request.data)
+        except UserImportError as error:
+            return Response({'errors': error.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'ids': [user.pk for user in result.users],
+                         'seconds': round(result.seconds, 3),
+                         'users_per_second': round(result.users_per_second, 1)}, status=status.HTTP_201_CREATED)
+
     @swagger_auto_schema(
         responses={
             status.HTTP_200_OK: UserSerializer,
@@ -72,9 +101,7 @@ class UserViewSet(viewsets.ModelViewSet):
             'request': request,
         }
 
-        auth_token = request.META.get(HTTP_AUTHORIZATION, '').replace('Token ', '')
-        user_name = Token.objects.get(key=auth_token).user
-        user = User.objects.filter(username=user_name, pk=kwargs['pk']).first()
+        user = User.objects.filter(pk=self.owner.pk).filter(pk=kwargs['pk']).first()
         if user:
             user_serializer = UserSerializer(user,
                                              data=request.data,
@@ -97,6 +97,11 @@ if any([arg in sys.argv for arg in ['jenkins', 'test']]):
             'NAME': 'test.db'
         }
     }
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        }
+    }
 else:
     DATABASES = {
         'default': {
@@ -116,6 +121,40 @@ else:
 SOUTH_TESTS_MIGRATE = False
 
 
+# List counts and list responses are cached in the default cache and invalidated by bumping versions there. A worker's
+# write only reaches the other workers through a shared backend (Redis, Memcached, database), so with the per-process
+# LocMemCache neither is cached unless CACHE_SINGLE_PROCESS is set for a deployment that runs exactly one process.
+
+CACHE_SINGLE_PROCESS = os.environ.get('CACHE_SINGLE_PROCESS') == '1'
+
+
+# List counts served by CachedCountPagination: cached per owner scope, and taken from the PostgreSQL planner estimate
+# instead of COUNT(*) once the estimate reaches APPROXIMATE_COUNT_THRESHOLD rows.
+
+PAGINATION_COUNT_CACHE_SECONDS = 300
+APPROXIMATE_COUNT_THRESHOLD = int(os.environ.get('APPROXIMATE_COUNT_THRESHOLD', 100000))
+
+
+# List responses for bugs, tasks and subtasks, cached per owner and dropped by bumping the owner's data version on every
+# write. Like the counts, they live in the default cache; `manage.py response_cache_stats` reports the hit ratio.
+
+LIST_RESPONSE_CACHE_SECONDS = int(os.environ.get('LIST_RESPONSE_CACHE_SECONDS', 300))
+
+
+# Soft-deleted rows untouched for this many days are moved to the archive tables by `manage.py archive_deleted`.
+
+ARCHIVE_DELETED_AFTER_DAYS = int(os.environ.get('ARCHIVE_DELETED_AFTER_DAYS', 30))
+
+
+# Largest JSON array accepted by the /bulk endpoints.
+
+BULK_MAX_BATCH_SIZE = int(os.environ.get('BULK_MAX_BATCH_SIZE', 500))
+
+# Processes used to hash passwords during bulk user imports; None uses one per CPU.
+
+USER_IMPORT_PROCESSES = int(os.environ['USER_IMPORT_PROCESSES']) if os.environ.get('USER_IMPORT_PROCESSES') else None
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
@@ -152,6 +191,22 @@ APPEND_SLASH = True
 
 TOKEN_EXPIRED_AFTER_SECONDS = 14400
 
+# In-process cache of authenticated tokens
+
+TOKEN_CACHE_MAX_SIZE = 1024
+TOKEN_CACHE_TTL_SECONDS = 300
+
+# Token issued at login: 'db' (rest_framework.authtoken Token) or 'signed' (stateless HMAC-signed token)
+
+AUTH_TOKEN_MODE = os.environ.get('AUTH_TOKEN_MODE', 'db')
+SIGNED_TOKEN_DENY_LIST_REFRESH_SECONDS = 30
+
+# Login history: 'sync' inserts one LoginInfo per login, 'write_behind' buffers them and bulk inserts
+
+LOGIN_INFO_RECORDING = os.environ.get('LOGIN_INFO_RECORDING', 'sync')
+LOGIN_INFO_FLUSH_SIZE = 100
+LOGIN_INFO_FLUSH_SECONDS = 5
+
 SWAGGER_SETTINGS = {
    'SECURITY_DEFINITIONS': {
       'Bearer': {
@@ -168,6 +223,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'api.authentication.signed_token_authentication.SignedTokenAuthentication',
         'api.authentication.expiring_token_authentication.ExpiringTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': (